@@ -0,0 +1,649 @@
+"""
+Benchmarks for the staffData data layer.
+
+Run one benchmark with `python benchmark.py <name>`, or `python benchmark.py --help` to list them.
+Every benchmark works on a scratch database in a temporary directory and never touches
+staff_management.db.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import generate_data
+import staffData
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def report(label, seconds, operations):
+    per_op = seconds / operations * 1e6 if operations else 0
+    print(f"{label:<40} {seconds:9.3f} s  {per_op:10.1f} us/op")
+
+def scratch_database(directory):
+    db_path = os.path.join(directory, 'bench.db')
+    staffData.configure_database(db_path)
+    staffData.create_database()
+    return db_path
+
+def seed_tickets(count):
+    staff = [name for names in staffData.STAFF_CATEGORIES.values() for name in names]
+    rows = []
+    for number in range(count):
+        rows.append((f"T{number:07d}", f"{random.randint(1, 12):02d}/{random.randint(1, 28):02d}/{random.randint(2019, 2024)}",
+                     "General", random.choice(staff), random.randint(1, 240), random.choice(staff),
+                     random.choice(staff), random.choice(staff), "Yes", ""))
+    conn = staffData.get_connection()
+    with conn:
+        conn.executemany(f"INSERT INTO tickets ({', '.join(staffData.TICKET_COLUMNS)}) "
+                         f"VALUES ({', '.join('?' * len(staffData.TICKET_COLUMNS))})", rows)
+    return [row[0] for row in rows]
+
+@benchmark('connections')
+def bench_connections(args):
+    """Per-call sqlite3.connect() against the pooled connection layer."""
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = scratch_database(directory)
+        numbers = seed_tickets(args.rows)
+        lookups = [random.choice(numbers) for _ in range(args.operations)]
+
+        def per_call_connection():
+            for number in lookups:
+                conn = sqlite3.connect(db_path)
+                c = conn.cursor()
+                c.execute("SELECT 1 FROM tickets WHERE ticket_number = ?", (number,))
+                c.fetchone()
+                conn.close()
+
+        def pooled_connection():
+            for number in lookups:
+                staffData.ticket_number_exists(number)
+
+        per_call, _ = timed(per_call_connection)
+        pooled, _ = timed(pooled_connection)
+        report("ticket lookup, connect per call", per_call, len(lookups))
+        report("ticket lookup, pooled connection", pooled, len(lookups))
+        print(f"speedup: {per_call / pooled:.1f}x")
+        staffData.close_connections()
+
+def write_ticket_workbook(path, rows, prefix, interactions=0, corrected=()):
+    """
+    Writes a workbook of synthetic tickets numbered from `prefix`, plus `interactions`
+    interaction rows drawn from a small pool so identical rows repeat. The same random seed
+    gives the same workbook; tickets whose index is in `corrected` get different notes.
+    """
+    import openpyxl
+    staff = [name for names in staffData.STAFF_CATEGORIES.values() for name in names]
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Tickets')
+    sheet.append(staffData.TICKET_EXPORT_HEADER)
+    for number in range(rows):
+        sheet.append([f"{prefix}{number:07d}", f"2024-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+                      "General", random.choice(staff), random.choice(staff), random.randint(1, 240),
+                      random.choice(staff), random.choice(staff), "Yes", "corrected" if number in corrected else ""])
+    if interactions:
+        sheet = workbook.create_sheet('Interactions')
+        sheet.append(staffData.INTERACTION_EXPORT_HEADER)
+        for _ in range(interactions):
+            sheet.append([random.choice(staff), f"2024-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+                          random.choice(("General", "Warning", "Mute"))])
+    workbook.save(path)
+
+@benchmark('parallel-import')
+def bench_parallel_import(args):
+    """Importing --files workbooks one by one against the process-pool import with one writer."""
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, f"team{team}.xlsx") for team in range(args.files)]
+        for team, path in enumerate(paths):
+            write_ticket_workbook(path, args.rows // args.files, f"W{team}-")
+
+        scratch_database(directory)
+        sequential, _ = timed(lambda: [staffData.import_workbook(path) for path in paths])
+        report(f"{args.files} workbooks, sequential", sequential, args.rows)
+
+        staffData.configure_database(os.path.join(directory, 'parallel.db'))
+        staffData.create_database()
+        parallel, _ = timed(staffData.import_workbooks, paths, args.workers or None)
+        report(f"{args.files} workbooks, {args.workers or os.cpu_count()} parse workers", parallel, args.rows)
+        print(f"speedup: {sequential / parallel:.1f}x on {os.cpu_count()} cores")
+        staffData.close_connections()
+
+@benchmark('reimport')
+def bench_reimport(args):
+    """Importing a workbook, re-importing it unchanged, then re-importing it with 1% of tickets corrected."""
+    with tempfile.TemporaryDirectory() as directory:
+        original = os.path.join(directory, 'original.xlsx')
+        corrected = os.path.join(directory, 'corrected.xlsx')
+        random.seed(42)
+        write_ticket_workbook(original, args.rows // 2, "R", args.rows // 2)
+        random.seed(42)
+        write_ticket_workbook(corrected, args.rows // 2, "R", args.rows // 2, corrected=set(range(0, args.rows // 2, 100)))
+
+        scratch_database(directory)
+        conn = staffData.get_connection()
+        for label, path in (("first import", original), ("re-import, unchanged", original),
+                            ("re-import, 1% corrected", corrected)):
+            changes = conn.total_changes
+            seconds, result = timed(staffData.import_workbook, path)
+            report(label, seconds, args.rows)
+            print(f"  {result.inserted} inserted, {result.updated} updated, {result.skipped} unchanged, "
+                  f"{result.duplicates} duplicate across files, {conn.total_changes - changes} rows written")
+
+        # Interactions entered in the app must survive an export and re-import without doubling
+        for _ in range(2):
+            staffData.insert_interaction(staffData.ModeratorInteraction("Amy", "05/31/2024", "Warning"))
+        exported = os.path.join(directory, 'exported.xlsx')
+        staffData.export_workbook(exported)
+        seconds, result = timed(staffData.import_workbook, exported)
+        report("export, then re-import", seconds, args.rows)
+        interactions = result.sheets['Interactions']
+        print(f"  {interactions['inserted']} interactions inserted, {interactions['skipped']} unchanged, "
+              f"{interactions['duplicates']} duplicate across files")
+        if interactions['inserted']:
+            print("  round trip inserted interactions that were already stored")
+        staffData.close_connections()
+
+def query_plan(query, params):
+    rows = staffData.get_connection().execute("EXPLAIN QUERY PLAN " + query, params).fetchall()
+    return "; ".join(row[-1] for row in rows)
+
+@benchmark('dates')
+def bench_dates(args):
+    """Legacy MM/DD/YYYY migration, then a month search with strftime() against an ISO range."""
+    with tempfile.TemporaryDirectory() as directory:
+        scratch_database(directory)
+        seed_tickets(args.rows)
+        conn = staffData.get_connection()
+
+        def migrate():
+            with conn:
+                staffData.migrate_to_iso_dates(conn)
+
+        seconds, _ = timed(migrate)
+        report(f"migrate {args.rows} legacy dates to ISO", seconds, args.rows)
+
+        function_query = ("SELECT * FROM tickets WHERE strftime('%m', date_of_ticket) = ? "
+                          "AND strftime('%Y', date_of_ticket) = ?")
+        function_params = ('06', '2024')
+        range_query = "SELECT * FROM tickets WHERE date_of_ticket >= ? AND date_of_ticket < ?"
+        range_params = staffData.month_range('06', '2024')
+
+        def run(query, params):
+            for _ in range(args.operations // 50 or 1):
+                conn.execute(query, params).fetchall()
+
+        searches = args.operations // 50 or 1
+        seconds, _ = timed(run, function_query, function_params)
+        report("month search, strftime() on column", seconds, searches)
+        print(f"  plan: {query_plan(function_query, function_params)}")
+        seconds, _ = timed(run, range_query, range_params)
+        report("month search, ISO range predicate", seconds, searches)
+        print(f"  plan: {query_plan(range_query, range_params)}")
+        staffData.close_connections()
+
+def legacy_convert_excel_date(date_value):
+    """
+    The per-cell strptime() cascade convert_excel_date() used before dates were cached.
+    """
+    if isinstance(date_value, staffData.datetime):
+        return date_value.strftime("%Y-%m-%d")
+    elif isinstance(date_value, (int, float)):
+        return (staffData.EXCEL_EPOCH + staffData.timedelta(days=int(date_value))).strftime("%Y-%m-%d")
+    for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y"):
+        try:
+            return staffData.datetime.strptime(date_value, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+    return None
+
+@benchmark('date-parsing')
+def bench_date_parsing(args):
+    """Per-cell strptime() cascade against the cached, layout-detecting date normalizer."""
+    days = [staffData.datetime(2023, 1, 1) + staffData.timedelta(days=offset) for offset in range(730)]
+    columns = {
+        "ISO text": [random.choice(days).strftime("%Y-%m-%d") for _ in range(args.rows)],
+        "MM/DD/YYYY text": [random.choice(days).strftime("%m/%d/%Y") for _ in range(args.rows)],
+        "DD/MM/YYYY text": [random.choice(days).strftime("%d/%m/%Y") for _ in range(args.rows)],
+    }
+    for label, values in columns.items():
+        staffData.parse_date_text.cache_clear()
+        legacy, expected = timed(lambda: [legacy_convert_excel_date(value) for value in values])
+        per_cell, _ = timed(lambda: [staffData.convert_excel_date(value) for value in values])
+        staffData.parse_date_text.cache_clear()
+        column, converted = timed(staffData.convert_date_column, values)
+        if label != "DD/MM/YYYY text" and converted != expected:
+            print(f"  {label}: column conversion differs from the legacy function")
+        report(f"{label}, strptime per cell", legacy, len(values))
+        report(f"{label}, cached per cell", per_cell, len(values))
+        report(f"{label}, column batch", column, len(values))
+        print(f"  speedup: {legacy / column:.1f}x")
+
+    iso_dates = [random.choice(days).strftime("%Y-%m-%d") for _ in range(args.rows)]
+    staffData.format_display_date.cache_clear()
+    uncached, _ = timed(lambda: [staffData.format_display_date.__wrapped__(value) for value in iso_dates])
+    cached, _ = timed(lambda: [staffData.format_display_date(value) for value in iso_dates])
+    report("display formatting, strptime per row", uncached, len(iso_dates))
+    report("display formatting, cached", cached, len(iso_dates))
+
+NOTE_WORDS = ["user", "banned", "refund", "appeal", "spam", "login", "crash", "payment", "report", "harassment",
+              "warning", "mute", "kick", "scam", "duplicate", "escalated", "resolved", "discord", "server", "verify"]
+
+def synthetic_note(number):
+    words = random.choices(NOTE_WORDS, k=random.randint(4, 12))
+    # A handful of tickets name a specific member, as the searches staff run usually do
+    if number % 5000 == 0:
+        words.append(f"member{number}")
+    return " ".join(words)
+
+@benchmark('text-search')
+def bench_text_search(args):
+    """Indexing notes per row by trigger against the bulk path imports use, then ranked full-text searches."""
+    staff = [name for names in staffData.STAFF_CATEGORIES.values() for name in names]
+    rows = [(f"T{number:07d}", f"2024-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}", "General",
+             random.choice(staff), random.randint(1, 240), random.choice(staff), random.choice(staff),
+             random.choice(staff), "Yes", synthetic_note(number)) for number in range(args.rows)]
+    rows = [row + (staffData.row_fingerprint(*row),) for row in rows]
+
+    with tempfile.TemporaryDirectory() as directory:
+        scratch_database(directory)
+        conn = staffData.get_connection()
+
+        def insert_with_triggers():
+            with conn:
+                conn.executemany(staffData.TICKET_UPSERT_SQL, rows)
+
+        def insert_bulk():
+            with conn, staffData.bulk_ticket_indexing(conn):
+                conn.executemany(staffData.TICKET_UPSERT_SQL, rows)
+
+        for label, insert in (("insert, index by trigger", insert_with_triggers), ("insert, bulk index", insert_bulk)):
+            with conn:
+                conn.execute("DELETE FROM tickets")
+            seconds, _ = timed(insert)
+            report(label, seconds, len(rows))
+
+        for text in (f"member{5000 * (args.rows // 10000)}", "refund appeal", "ban*", "user"):
+            seconds, total = timed(staffData.count_text_search, text)
+            report(f"count '{text}' ({total} tickets)", seconds, 1)
+            seconds, page = timed(staffData.get_text_search_page, text)
+            report(f"first page '{text}'", seconds, 1)
+            if page:
+                seconds, _ = timed(staffData.get_text_search_page, text, after=staffData.text_search_sort_key(page[-1]))
+                report(f"second page '{text}'", seconds, 1)
+        staffData.close_connections()
+
+class DictTicket:
+    """
+    A ticket record with a per-instance __dict__, as Ticket was before it used __slots__.
+    """
+    def __init__(self, row):
+        (self.ticket_number, self.date_of_ticket, self.ticket_type, self.answered_by, self.response_time,
+         self.claimed_by, self.closed_by, self.reviewed_by, self.handled, self.notes) = row
+
+def synthetic_ticket_rows(count):
+    staff = [name for names in staffData.STAFF_CATEGORIES.values() for name in names]
+    types = ["General", "Appeal", "Report", "Billing", "Bug"]
+    days = [(staffData.datetime(2019, 1, 1) + staffData.timedelta(days=offset)).strftime("%Y-%m-%d")
+            for offset in range(2000)]
+    return [(f"T{number:07d}", random.choice(days), random.choice(types), random.choice(staff), random.randint(1, 240),
+             random.choice(staff), random.choice(staff), random.choice(staff), random.choice(("Yes", "No")), "")
+            for number in range(count)]
+
+def traced_memory(func, *args):
+    """
+    Bytes still allocated by the object func() returns; strings shared with the source rows are not counted.
+    """
+    tracemalloc.start()
+    result = func(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+@benchmark('ticket-memory')
+def bench_ticket_memory(args):
+    """Memory and build/aggregate throughput of __dict__ objects, __slots__ Tickets and a TicketBatch (try --rows 1000000)."""
+    rows = synthetic_ticket_rows(args.rows)
+    builders = {
+        "__dict__ objects": lambda: [DictTicket(row) for row in rows],
+        "__slots__ Ticket.from_row": lambda: [staffData.Ticket.from_row(row) for row in rows],
+        "columnar TicketBatch": lambda: staffData.TicketBatch.from_rows(rows),
+    }
+    for label, build in builders.items():
+        print(f"{label:<40} {traced_memory(build) / len(rows):9.1f} bytes/ticket")
+
+    for label, build in builders.items():
+        seconds, _ = timed(build)
+        report(f"build, {label}", seconds, len(rows))
+
+    tickets = builders["__slots__ Ticket.from_row"]()
+    batch = builders["columnar TicketBatch"]()
+
+    def mean_by_staff_objects():
+        totals = {}
+        for ticket in tickets:
+            total = totals.setdefault(ticket.answered_by, [0, 0])
+            total[0] += ticket.response_time
+            total[1] += 1
+        return {name: total / count for name, (total, count) in totals.items()}
+
+    def mean_by_staff_batch():
+        import numpy as np
+        sums = np.bincount(batch.answered_by, weights=batch.response_times, minlength=len(batch.staff.values))
+        counts = np.bincount(batch.answered_by, minlength=len(batch.staff.values))
+        return {name: sums[code] / counts[code] for code, name in enumerate(batch.staff.values) if counts[code]}
+
+    seconds, _ = timed(mean_by_staff_objects)
+    report("mean response per staff, objects", seconds, len(rows))
+    seconds, _ = timed(mean_by_staff_batch)
+    report("mean response per staff, batch", seconds, len(rows))
+
+def ticket_event_lines(count, prefix):
+    staff = [name for names in staffData.STAFF_CATEGORIES.values() for name in names]
+    return [json.dumps({'type': 'ticket', 'id': f"{prefix}{number}", 'ticket_number': f"{prefix}{number:07d}",
+                        'date_of_ticket': "2024-05-31", 'ticket_type': "General", 'answered_by': random.choice(staff),
+                        'response_time': random.randint(1, 240), 'handled': "Yes", 'notes': "streamed"})
+            for number in range(count)]
+
+@benchmark('ingest')
+def bench_ingest(args):
+    """--operations streamed ticket events: one insert_ticket() commit each against IngestWriter micro-batches."""
+    import io
+    with tempfile.TemporaryDirectory() as directory:
+        scratch_database(directory)
+        staffData.get_connection().execute("PRAGMA synchronous = FULL")
+        tickets = [staffData.Ticket(f"P{number:07d}", "05/31/2024", "General", "Amy", number % 240)
+                   for number in range(min(args.operations, 2000))]
+
+        def per_event_commit():
+            for ticket in tickets:
+                staffData.insert_ticket(ticket)
+
+        seconds, _ = timed(per_event_commit)
+        report("insert_ticket, one commit per event", seconds, len(tickets))
+
+        for batch_size in (50, 500, 2000):
+            lines = ticket_event_lines(args.operations, f"B{batch_size}-")
+
+            def micro_batches():
+                writer = staffData.IngestWriter(batch_size)
+                staffData.ingest_lines(writer, lines, staffData.IngestStream(io.BytesIO()))
+                writer.close()
+                return writer.batches
+
+            seconds, batches = timed(micro_batches)
+            report(f"IngestWriter, batches of {batch_size} ({batches})", seconds, len(lines))
+        staffData.close_connections()
+
+async def http_get(reader, writer, target, etag=None):
+    """
+    One keep-alive GET; returns (status, ETag).
+    """
+    request = f"GET {target} HTTP/1.1\r\nHost: localhost\r\n" + (f"If-None-Match: {etag}\r\n" if etag else "") + "\r\n"
+    writer.write(request.encode())
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode('latin-1')
+    headers = dict(line.split(": ", 1) for line in head.split("\r\n")[1:] if ": " in line)
+    await reader.readexactly(int(headers.get('Content-Length', 0)))
+    return int(head.split()[1]), headers.get('ETag')
+
+async def http_load(port, targets, clients, requests):
+    """
+    `clients` keep-alive connections sending `requests` GETs in total, each for a random
+    target and revalidating with If-None-Match when that client has seen the target before.
+    Returns the latency of every request and a count per status.
+    """
+    import asyncio
+    latencies = []
+    statuses = {}
+    remaining = [requests]
+
+    async def client():
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        etags = {}
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            target = random.choice(targets)
+            start = time.perf_counter()
+            status, etag = await http_get(reader, writer, target, etags.get(target))
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+            etags[target] = etag or etags.get(target)
+        writer.close()
+
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return latencies, statuses
+
+@benchmark('http-load')
+def bench_http_load(args):
+    """--operations requests from --clients concurrent keep-alive clients against `staffData.py serve`."""
+    import asyncio
+    import socket
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'bench.db')
+        staffData.configure_database(db_path)
+        data = generate_data.SyntheticData(args.rows, args.rows)
+        generate_data.fill_database(data)
+        staffData.close_connections()
+
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+        server = subprocess.Popen([sys.executable, os.path.abspath(staffData.__file__), '--db', db_path, 'serve',
+                                   '--port', str(port)], stdout=subprocess.PIPE, text=True)
+        try:
+            server.stdout.readline()
+            names = [name for name, _ in data.staff()]
+            targets = ([f"/tickets?moderator={name}" for name in names] +
+                       [f"/interactions?moderator={name}&limit=50" for name in names] +
+                       ["/trends/tickets?months=6", "/trends/interactions?months=12", "/staff"])
+            seconds, (latencies, statuses) = timed(asyncio.run, http_load(port, targets, args.clients, args.operations))
+        finally:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    percentile = lambda share: latencies[min(int(share * len(latencies)), len(latencies) - 1)] * 1000
+    print(f"{len(latencies)} requests from {args.clients} clients in {seconds:.2f} s: {len(latencies) / seconds:.0f} requests/s")
+    print(f"latency p50 {percentile(0.5):.1f} ms  p95 {percentile(0.95):.1f} ms  p99 {percentile(0.99):.1f} ms  "
+          f"max {latencies[-1] * 1000:.1f} ms")
+    print("responses: " + ", ".join(f"{count} x {status}" for status, count in sorted(statuses.items())))
+
+@benchmark('charts')
+def bench_charts(args):
+    """Trend chart renders: the first one, re-renders on the reused figure, and repeats from the cache."""
+    with tempfile.TemporaryDirectory() as directory:
+        staffData.configure_database(os.path.join(directory, 'bench.db'))
+        generate_data.fill_database(generate_data.SyntheticData(args.rows, args.rows))
+        seconds, _ = timed(staffData.render_trend_chart, 'tickets', 6)
+        report("first chart (imports matplotlib)", seconds, 1)
+        for kind, months, moderator in (('tickets', 3, None), ('interactions', 6, None), ('interactions', 12, "Amy")):
+            seconds, _ = timed(staffData.render_trend_chart, kind, months, moderator)
+            report(f"render {kind}, {months} months", seconds, 1)
+        seconds, _ = timed(lambda: [staffData.render_trend_chart('tickets', 6) for _ in range(args.operations)])
+        report("cached chart", seconds, args.operations)
+        staffData.close_connections()
+
+def git_revision():
+    directory = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                                cwd=directory).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True,
+                                    text=True, check=True, cwd=directory).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+def measure(results, case, rows, func, *args, repeat=1, cached=False):
+    """
+    Runs func(*args) `repeat` times and records the fastest and median wall time for the case.
+    The result cache is cleared before each run unless `cached` is set.
+    """
+    times = []
+    for _ in range(repeat):
+        if not cached:
+            staffData.clear_result_cache()
+        times.append(timed(func, *args)[0])
+    results.append({'case': case, 'rows': rows, 'repeat': repeat, 'min_s': min(times), 'median_s': statistics.median(times)})
+    print(f"{case:<44} {rows:>9} rows  {min(times) * 1000:10.2f} ms min  {statistics.median(times) * 1000:10.2f} ms median")
+
+def busiest(query):
+    return staffData.get_connection().execute(query).fetchone()
+
+def run_suite_size(results, rows, repeat, directory):
+    data = generate_data.SyntheticData(rows, rows, extra_staff=20)
+    workbook = os.path.join(directory, f'synthetic_{rows}.xlsx')
+    generate_data.write_workbooks(data, [workbook])
+
+    staffData.configure_database(os.path.join(directory, f'import_{rows}.db'))
+    staffData.create_database()
+    measure(results, "upload_from_excel (import_workbook)", rows * 2, staffData.import_workbook, workbook)
+
+    staffData.configure_database(os.path.join(directory, f'suite_{rows}.db'))
+    measure(results, "generate database", rows * 2, generate_data.fill_database, data)
+    measure(results, "export_to_excel (export_workbook)", rows * 2, staffData.export_workbook,
+            os.path.join(directory, f'export_{rows}.xlsx'))
+
+    moderator, month = busiest("SELECT answered_by, substr(max(date_of_ticket), 1, 7) FROM tickets "
+                               "GROUP BY answered_by ORDER BY COUNT(*) DESC LIMIT 1")
+    year, month = month.split('-')
+    interaction_moderator = busiest("SELECT moderator_name FROM interactions GROUP BY moderator_name "
+                                    "ORDER BY COUNT(*) DESC LIMIT 1")[0]
+    measure(results, "get_filtered_tickets, month", rows, staffData.get_filtered_tickets, moderator, month, year, repeat=repeat)
+    measure(results, "get_filtered_tickets, all time", rows, staffData.get_filtered_tickets, moderator, repeat=repeat)
+    measure(results, "get_filtered_interactions, month", rows, staffData.get_filtered_interactions,
+            interaction_moderator, month, year, repeat=repeat)
+    measure(results, "get_filtered_interactions, all time", rows, staffData.get_filtered_interactions,
+            interaction_moderator, None, None, repeat=repeat)
+    measure(results, "get_ticket_trends, 12 months", rows, staffData.get_ticket_trends, 12, repeat=repeat)
+    measure(results, "get_interaction_trends, 12 months", rows, staffData.get_interaction_trends, 12, repeat=repeat)
+    measure(results, "get_interaction_trends, 12 months, moderator", rows, staffData.get_interaction_trends,
+            12, interaction_moderator, repeat=repeat)
+    measure(results, "get_staff_scorecard, month", rows, staffData.get_staff_scorecard, month, year, repeat=repeat)
+    measure(results, "get_staff_scorecard, all time", rows, staffData.get_staff_scorecard, repeat=repeat)
+    measure(results, "get_filtered_tickets, month, cached", rows, staffData.get_filtered_tickets, moderator, month, year,
+            repeat=repeat, cached=True)
+    measure(results, "get_ticket_trends, 12 months, cached", rows, staffData.get_ticket_trends, 12, repeat=repeat, cached=True)
+    tickets = staffData.get_filtered_tickets(moderator)
+    measure(results, "calculate_average_response_time", len(tickets), staffData.calculate_average_response_time,
+            tickets, repeat=repeat)
+    staffData.close_connections()
+
+@benchmark('suite')
+def bench_suite(args):
+    """The data-layer hot paths at each of --sizes rows, saved as JSON with --output and compared with --compare."""
+    commit, dirty = git_revision()
+    report_data = {
+        'commit': commit, 'dirty': dirty, 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(), 'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(), 'cpu_count': os.cpu_count(), 'results': [],
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in (int(size) for size in args.sizes.split(',')):
+            run_suite_size(report_data['results'], rows, args.repeat, directory)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report_data, output, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        previous = {(result['case'], result['rows']): result['min_s'] for result in baseline['results']}
+        print(f"\nAgainst {baseline.get('commit') or args.compare}:")
+        for result in report_data['results']:
+            before = previous.get((result['case'], result['rows']))
+            if before:
+                print(f"{result['case']:<44} {result['rows']:>9} rows  {before / result['min_s']:6.2f}x")
+
+# Script run in a fresh interpreter to time launching the application up to its first drawn window
+FIRST_WINDOW_SCRIPT = """
+import time
+start = time.perf_counter()
+import tkinter as tk
+import generate_data
+import staffData
+root = tk.Tk()
+app = staffData.TicketApp(root)
+root.update()
+print(time.perf_counter() - start)
+app.jobs.shutdown()
+root.destroy()
+"""
+
+def import_times(module):
+    """Cumulative import time in microseconds per module, from `python -X importtime`."""
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__))).stderr
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, _, cumulative, name = [part.strip() for part in line.replace('import time:', '|').split('|')]
+        times[name] = int(cumulative)
+    return times
+
+@benchmark('startup')
+def bench_startup(args):
+    """Cold import time of staffData and time to the first drawn window; --max-import-ms fails on regression."""
+    times = import_times('staffData')
+    import_ms = times['staffData'] / 1000
+    print(f"{'import staffData (cumulative)':<40} {import_ms:9.1f} ms")
+    for heavy in ('openpyxl', 'matplotlib', 'numpy'):
+        if heavy in times:
+            print(f"  {heavy} is imported at startup ({times[heavy] / 1000:.1f} ms)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, STAFF_DB_PATH=os.path.join(directory, 'bench.db'))
+        for label in ("first window, new database", "first window, existing database"):
+            result = subprocess.run([sys.executable, '-c', FIRST_WINDOW_SCRIPT], capture_output=True, text=True,
+                                    env=env, cwd=os.path.dirname(os.path.abspath(__file__)))
+            if result.returncode != 0:
+                print(f"{label:<40} skipped (no display available)")
+                break
+            print(f"{label:<40} {float(result.stdout) * 1000:9.1f} ms")
+
+    if args.max_import_ms and import_ms > args.max_import_ms:
+        print(f"FAIL: import took {import_ms:.1f} ms, limit is {args.max_import_ms} ms")
+        sys.exit(1)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('name', choices=sorted(BENCHMARKS), help="benchmark to run")
+    parser.add_argument('--rows', type=int, default=10000, help="rows to seed into the scratch database")
+    parser.add_argument('--operations', type=int, default=5000, help="operations to time")
+    parser.add_argument('--max-import-ms', type=float, help="startup: fail if importing staffData takes longer")
+    parser.add_argument('--files', type=int, default=8, help="parallel-import: number of workbooks")
+    parser.add_argument('--workers', type=int, default=0, help="parallel-import: parse processes (default: one per core)")
+    parser.add_argument('--sizes', default='10000,100000,1000000', help="suite: comma-separated data set sizes")
+    parser.add_argument('--repeat', type=int, default=5, help="suite: runs per query case; the fastest is reported")
+    parser.add_argument('--output', help="suite: write the results to this JSON file")
+    parser.add_argument('--compare', help="suite: print speedups against an earlier JSON results file")
+    parser.add_argument('--clients', type=int, default=200, help="http-load: concurrent client connections")
+    args = parser.parse_args()
+    random.seed(42)
+    BENCHMARKS[args.name](args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Synthetic data for exercising staffData at realistic volumes.
+
+`python generate_data.py --tickets 100000 --interactions 50000` fills staff_management.db (or
+--db) and `--workbooks N` also writes the same rows as N importable .xlsx files. Rows go
+through the importer's own normalize and write steps, so a generated database and its
+workbooks agree row for row and re-importing the workbooks changes nothing.
+"""
+import argparse
+import os
+import random
+from datetime import datetime, timedelta
+
+import staffData
+
+TICKET_TYPES = ["General", "Appeal", "Report", "Billing", "Bug Report", "Ban Appeal", "Staff Application"]
+TICKET_TYPE_WEIGHTS = [40, 15, 20, 5, 10, 8, 2]
+INTERACTION_TYPES = ["General", "Warning", "Mute", "Kick", "Ban", "Verification"]
+INTERACTION_TYPE_WEIGHTS = [50, 20, 12, 8, 5, 5]
+NOTE_WORDS = ["user", "banned", "refund", "appeal", "spam", "login", "crash", "payment", "report", "harassment",
+              "warning", "mute", "kick", "scam", "duplicate", "escalated", "resolved", "discord", "server", "verify",
+              "account", "purchase", "rank", "permissions", "evidence", "screenshot", "timeout", "alt", "vpn", "chargeback"]
+
+def activity_weights(count, rng):
+    # A few staff members handle most of the work, as in the real data
+    return [rng.paretovariate(1.2) for _ in range(count)]
+
+class SyntheticData:
+    """
+    A generated data set. Rows are produced lazily and identically on every call from the
+    seed, so millions of rows can be written to a database and to workbooks without ever
+    being held in memory.
+    """
+    def __init__(self, tickets, interactions, extra_staff=0, months=24, seed=42):
+        self.counts = {'Tickets': tickets, 'Interactions': interactions}
+        self.extra_staff = extra_staff
+        self.days = months * 30
+        self.start = datetime.now() - timedelta(days=self.days)
+        self.seed = seed
+
+    def staff(self):
+        """
+        The default STAFF_CATEGORIES members plus the generated ones spread over the ranked
+        categories, as (name, category) pairs.
+        """
+        rng = random.Random(f"{self.seed}-staff")
+        staff = [(name, category) for category, names in staffData.STAFF_CATEGORIES.items() for name in sorted(names)]
+        for number in range(self.extra_staff):
+            staff.append((f"Staff{number:04d}", rng.choice(staffData.CATEGORY_RANKS)))
+        return staff
+
+    def rows(self, sheet_name):
+        rng = random.Random(f"{self.seed}-{sheet_name}")
+        staff_names = [name for name, _ in self.staff()]
+        generate = self.ticket_rows if sheet_name == 'Tickets' else self.interaction_rows
+        return generate(self.counts[sheet_name], staff_names, rng)
+
+    def random_date(self, rng):
+        return (self.start + timedelta(days=rng.randrange(self.days))).strftime("%Y-%m-%d")
+
+    def ticket_rows(self, count, staff_names, rng):
+        """
+        Tickets sheet rows in TICKET_EXPORT_HEADER order, with sequential numbers and
+        roughly log-normal response times in minutes.
+        """
+        weights = activity_weights(len(staff_names), rng)
+        for number in range(count):
+            answered_by, claimed_by, closed_by, reviewed_by = rng.choices(staff_names, weights, k=4)
+            if rng.random() < 0.6:
+                claimed_by = answered_by
+            notes = rng.choices(NOTE_WORDS, k=rng.randint(3, 15))
+            if rng.random() < 0.02:
+                notes.append(f"member{rng.randint(1, count // 10 + 1)}")
+            yield (f"T{number:08d}", self.random_date(rng), rng.choices(TICKET_TYPES, TICKET_TYPE_WEIGHTS)[0],
+                   answered_by, claimed_by, min(int(rng.lognormvariate(3.2, 1.0)) + 1, 1440), closed_by,
+                   reviewed_by, "Yes" if rng.random() < 0.9 else "No", " ".join(notes))
+
+    def interaction_rows(self, count, staff_names, rng):
+        # Interactions sheet rows in INTERACTION_EXPORT_HEADER order
+        weights = activity_weights(len(staff_names), rng)
+        for _ in range(count):
+            yield (rng.choices(staff_names, weights)[0], self.random_date(rng),
+                   rng.choices(INTERACTION_TYPES, INTERACTION_TYPE_WEIGHTS)[0])
+
+def fill_database(data, batch_size=staffData.IMPORT_BATCH_SIZE):
+    """
+    Writes a SyntheticData set into the configured database with the importer's own
+    normalize and write steps, in one transaction. Returns an ImportResult.
+    """
+    staffData.create_database()
+    conn = staffData.get_connection()
+    result = staffData.ImportResult()
+    with conn, staffData.bulk_ticket_indexing(conn):
+        conn.executemany("INSERT OR IGNORE INTO staff (name, category) VALUES (?, ?)", data.staff())
+        for sheet_name, normalize, write, numbered in staffData.IMPORT_SHEETS:
+            staffData.import_rows(conn, data.rows(sheet_name), normalize, write, result.sheet(sheet_name), batch_size,
+                                  occurrences={} if numbered else None)
+    return result
+
+def write_workbooks(data, paths):
+    """
+    Writes a SyntheticData set as importable write-only workbooks, splitting the rows of
+    each sheet into contiguous runs of equal size, one per path. Repeated interactions are
+    numbered per file on import, so an interaction repeated in two different files is kept
+    once when the files are imported into an empty database and the later copy is reported
+    as a duplicate across files.
+    """
+    import openpyxl
+    headers = {'Tickets': staffData.TICKET_EXPORT_HEADER, 'Interactions': staffData.INTERACTION_EXPORT_HEADER}
+    workbooks = [openpyxl.Workbook(write_only=True) for _ in paths]
+    for sheet_name, header in headers.items():
+        sheets = [workbook.create_sheet(sheet_name) for workbook in workbooks]
+        for sheet in sheets:
+            sheet.append(header)
+        share = -(-data.counts[sheet_name] // len(paths)) or 1
+        for index, row in enumerate(data.rows(sheet_name)):
+            sheets[index // share].append(row)
+    for workbook, path in zip(workbooks, paths):
+        workbook.save(path)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--db', default=staffData.DB_PATH, help="database to fill (default: %(default)s)")
+    parser.add_argument('--tickets', type=int, default=10000, help="tickets to generate")
+    parser.add_argument('--interactions', type=int, default=10000, help="interactions to generate")
+    parser.add_argument('--staff', type=int, default=0, help="extra staff members beyond STAFF_CATEGORIES")
+    parser.add_argument('--months', type=int, default=24, help="months of history ending today")
+    parser.add_argument('--seed', type=int, default=42, help="random seed")
+    parser.add_argument('--workbooks', type=int, default=0, help="also write the rows as this many .xlsx files")
+    parser.add_argument('--workbook-dir', default='.', help="directory for the workbooks (default: current)")
+    parser.add_argument('--no-db', action='store_true', help="only write the workbooks")
+    args = parser.parse_args()
+
+    data = SyntheticData(args.tickets, args.interactions, args.staff, args.months, args.seed)
+    if not args.no_db:
+        staffData.configure_database(args.db)
+        result = fill_database(data)
+        print(f"{args.db}: {len(data.staff())} staff")
+        print(result.summary())
+    if args.workbooks:
+        paths = [os.path.join(args.workbook_dir, f"synthetic_{index + 1:02d}.xlsx") for index in range(args.workbooks)]
+        write_workbooks(data, paths)
+        print(f"Wrote {', '.join(paths)}")
+
+if __name__ == "__main__":
+    main()
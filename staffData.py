@@ -1,11 +1,34 @@
+import argparse
+import base64
+import csv
+import hashlib
+import io
+import json
+import os
+import queue
 import sqlite3
-from datetime import datetime, timedelta
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-import openpyxl
-import matplotlib.pyplot as plt
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from functools import lru_cache, wraps
 import re
 
+try:
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog
+except ImportError:
+    # Python builds without Tk can still use the headless command line interface
+    tk = ttk = messagebox = filedialog = None
+
+# openpyxl, matplotlib and numpy are imported inside the functions that use them, so
+# launching the application does not pay for them until an Excel, trend or statistics
+# feature is first used.
+
 # Define allowed names with categories
 STAFF_CATEGORIES = {
     "Discord Support": {"Asher", "Ogea", "Jerome"},
@@ -21,8 +44,339 @@ CATEGORY_RANKS = [
     "Governor", "Community Manager", "Lieutenant Governor", "Commissioner", "Chairman", "Councilman"
 ]
 
+# Database location; override with the STAFF_DB_PATH environment variable or configure_database()
+DB_PATH = os.environ.get('STAFF_DB_PATH', 'staff_management.db')
+
+# Pragmas applied once to every pooled connection when it is opened
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Statements whose execute and fetch time passes this get their query plan recorded
+SLOW_QUERY_SECONDS = 0.1
+
+class QueryStats:
+    """
+    Timings of the SQLite statements run on pooled connections, aggregated per operation
+    (the staffData function that ran them) and per statement, with the query plan of every
+    statement that took longer than slow_query_seconds. Functions decorated with
+    @instrumented name the operation for all the statements they run and also have their
+    own wall time recorded; other statements are attributed to the function that ran them.
+    """
+    def __init__(self, slow_query_seconds=SLOW_QUERY_SECONDS):
+        self.slow_query_seconds = slow_query_seconds
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.operations = {}
+            self.statements = {}
+            self.slow_queries = {}
+
+    def current_operation(self):
+        return getattr(self._local, 'operation', None)
+
+    def record_operation(self, name, seconds):
+        with self._lock:
+            entry = self.operations.setdefault(name, {'operation': name, 'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+            entry['calls'] += 1
+            entry['seconds'] += seconds
+            entry['max_seconds'] = max(entry['max_seconds'], seconds)
+
+    def statement(self, operation, sql):
+        """
+        Counts one execution of a statement and returns its entry for the timings that follow.
+        """
+        with self._lock:
+            entry = self.statements.get((operation, sql))
+            if entry is None:
+                entry = self.statements[(operation, sql)] = {'operation': operation, 'sql': sql, 'calls': 0,
+                                                             'seconds': 0.0, 'max_seconds': 0.0, 'rows': 0}
+            entry['calls'] += 1
+        return entry
+
+    def add_time(self, entry, seconds, rows, execution_seconds):
+        with self._lock:
+            entry['seconds'] += seconds
+            entry['rows'] += rows
+            entry['max_seconds'] = max(entry['max_seconds'], execution_seconds)
+
+    def record_slow_query(self, entry, seconds, plan):
+        with self._lock:
+            slow = self.slow_queries.setdefault(entry['sql'], {'operation': entry['operation'], 'sql': entry['sql'],
+                                                               'count': 0, 'max_seconds': 0.0, 'plan': plan})
+            slow['count'] += 1
+            slow['max_seconds'] = max(slow['max_seconds'], seconds)
+
+    def snapshot(self):
+        """
+        A JSON-serializable copy of the statistics, slowest first.
+        """
+        with self._lock:
+            by_time = lambda entries: sorted((dict(entry) for entry in entries), key=lambda entry: -entry.get('seconds', 0))
+            return {
+                'slow_query_seconds': self.slow_query_seconds,
+                'operations': by_time(self.operations.values()),
+                'statements': by_time(self.statements.values()),
+                'slow_queries': sorted((dict(slow) for slow in self.slow_queries.values()), key=lambda slow: -slow['max_seconds']),
+            }
+
+    def prometheus_text(self):
+        """
+        The statistics in the Prometheus text exposition format.
+        """
+        snapshot = self.snapshot()
+        label = lambda value: value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        lines = []
+        metrics = [
+            ('staffdata_operation_calls_total', "Calls of each instrumented operation", 'operations', 'calls'),
+            ('staffdata_operation_seconds_total', "Wall time spent in each instrumented operation", 'operations', 'seconds'),
+            ('staffdata_query_calls_total', "SQLite statements executed, per operation", 'statements', 'calls'),
+            ('staffdata_query_seconds_total', "Time spent executing and fetching SQLite statements, per operation", 'statements', 'seconds'),
+            ('staffdata_query_rows_total', "Rows fetched from SQLite statements, per operation", 'statements', 'rows'),
+        ]
+        for name, description, section, field in metrics:
+            totals = {}
+            for entry in snapshot[section]:
+                totals[entry['operation']] = totals.get(entry['operation'], 0) + entry[field]
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f'{name}{{operation="{label(operation)}"}} {value}' for operation, value in sorted(totals.items()))
+        return "\n".join(lines) + "\n"
+
+query_stats = QueryStats()
+
+def instrumented(func):
+    """
+    Records the wall time of each call to func and attributes the statements it runs,
+    including those in helpers it calls, to func's name. Nested calls count for the
+    outermost instrumented function only.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        local = query_stats._local
+        if getattr(local, 'operation', None):
+            return func(*args, **kwargs)
+        local.operation = func.__name__
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            local.operation = None
+            query_stats.record_operation(func.__name__, time.perf_counter() - start)
+    return wrapper
+
+# Rows fetched at a time when an instrumented cursor is iterated
+ITERATION_CHUNK_SIZE = 256
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Cursor that reports the time spent executing each statement and fetching its rows,
+    and the number of rows fetched, to query_stats.
+    """
+    _entry = None
+
+    def execute(self, sql, parameters=()):
+        self._begin(sql, parameters)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._add(time.perf_counter() - start, 0)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._begin(sql, None)
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._add(time.perf_counter() - start, 0)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._add(time.perf_counter() - start, row is not None)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._add(time.perf_counter() - start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._add(time.perf_counter() - start, len(rows))
+        return rows
+
+    def __iter__(self):
+        # Rows are timed a chunk at a time; timing every row would cost more than fetching it
+        while True:
+            rows = self.fetchmany(ITERATION_CHUNK_SIZE)
+            if not rows:
+                return
+            yield from rows
+
+    def _begin(self, sql, parameters):
+        self._entry = query_stats.statement(query_stats.current_operation() or caller_name(), sql)
+        self._parameters = parameters
+        self._elapsed = 0.0
+        self._explained = False
+
+    def _add(self, seconds, rows):
+        if self._entry is None:
+            return
+        self._elapsed += seconds
+        query_stats.add_time(self._entry, seconds, rows, self._elapsed)
+        if self._elapsed >= query_stats.slow_query_seconds and not self._explained:
+            # executemany() has no single parameter set to explain the plan with
+            self._explained = True
+            plan = [] if self._parameters is None else explain_statement(self.connection, self._entry['sql'], self._parameters)
+            query_stats.record_slow_query(self._entry, self._elapsed, plan)
+
+class InstrumentedConnection(sqlite3.Connection):
+    """
+    Connection whose cursors, including those made by execute() and executemany(), are InstrumentedCursors.
+    """
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+INSTRUMENTATION_CODE = {method.__code__ for method in (
+    InstrumentedCursor.execute, InstrumentedCursor.executemany, InstrumentedCursor._begin,
+    InstrumentedConnection.execute, InstrumentedConnection.executemany)}
+
+# Name of the function that ran a statement, skipping the instrumentation's own frames
+def caller_name():
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code in INSTRUMENTATION_CODE:
+        frame = frame.f_back
+    return frame.f_code.co_name if frame is not None else "unknown"
+
+# EXPLAIN QUERY PLAN on a plain cursor, so explaining a slow statement is not itself recorded
+def explain_statement(conn, sql, parameters):
+    try:
+        return [row[-1] for row in sqlite3.Cursor(conn).execute("EXPLAIN QUERY PLAN " + sql, parameters)]
+    except sqlite3.Error:
+        return []
+
+def dump_query_stats(file_path):
+    """
+    Writes query_stats and the result cache statistics to a file: Prometheus text for .prom
+    and .txt files, JSON otherwise.
+    """
+    with open(file_path, 'w') as output:
+        if file_path.endswith(('.prom', '.txt')):
+            output.write(query_stats.prometheus_text() + _results.prometheus_text())
+        else:
+            json.dump({**query_stats.snapshot(), 'result_cache': _results.stats()}, output, indent=2)
+
+# Directory for cProfile captures of import and export jobs; None leaves profiling off
+_profile_dir = os.environ.get('STAFF_PROFILE_DIR')
+
+def set_profile_dir(directory):
+    global _profile_dir
+    _profile_dir = directory
+
+def get_profile_dir():
+    return _profile_dir
+
+def profiled(func, *args, **kwargs):
+    """
+    Calls func, under cProfile when a profile directory is set. The capture is saved as
+    <directory>/<function>-<timestamp>.prof for pstats or snakeviz.
+    """
+    if not _profile_dir:
+        return func(*args, **kwargs)
+    import cProfile
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        os.makedirs(_profile_dir, exist_ok=True)
+        profiler.dump_stats(os.path.join(_profile_dir, f"{func.__name__}-{datetime.now():%Y%m%d-%H%M%S-%f}.prof"))
+
+class ConnectionPool:
+    """
+    Hands out one long-lived SQLite connection per thread, so the database file, schema
+    and page cache are set up once per thread instead of once per query.
+    """
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self._monitor = None
+
+    def get_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False, factory=InstrumentedConnection)
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def data_version(self):
+        """
+        PRAGMA data_version of a dedicated connection that never writes, so the value changes
+        whenever any other connection, in this process or another, commits to the database.
+        """
+        with self._lock:
+            if self._monitor is None:
+                self._monitor = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            return self._monitor.execute("PRAGMA data_version").fetchone()[0]
+
+    def close_all(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+            self._local = threading.local()
+            if self._monitor is not None:
+                self._monitor.close()
+                self._monitor = None
+
+_pool = ConnectionPool(DB_PATH)
+
+def configure_database(db_path):
+    """
+    Points the data layer at another database file, closing any connections to the old one.
+    """
+    global _pool
+    _pool.close_all()
+    _pool = ConnectionPool(db_path)
+    _roster.invalidate()
+    _results.invalidate()
+
+def get_connection():
+    return _pool.get_connection()
+
+def data_version():
+    return _pool.data_version()
+
+def close_connections():
+    _pool.close_all()
+
 # Ticket Class Definition
 class Ticket:
+    __slots__ = ('ticket_number', 'date_of_ticket', 'ticket_type', 'answered_by', 'response_time',
+                 'claimed_by', 'closed_by', 'reviewed_by', 'handled', 'notes')
+
     def __init__(self, ticket_number=None, date_of_ticket=None, ticket_type=None, answered_by=None,
                  response_time=None, claimed_by=None, closed_by=None, reviewed_by=None, handled=None, notes=None):
         self.ticket_number = ticket_number
@@ -36,6 +390,17 @@ class Ticket:
         self.handled = handled
         self.notes = notes
 
+    @classmethod
+    def from_row(cls, row):
+        """
+        Builds a Ticket from a tickets table row as stored, skipping the conversions
+        __init__ applies to values typed into the entry form.
+        """
+        ticket = cls.__new__(cls)
+        (ticket.ticket_number, ticket.date_of_ticket, ticket.ticket_type, ticket.answered_by, ticket.response_time,
+         ticket.claimed_by, ticket.closed_by, ticket.reviewed_by, ticket.handled, ticket.notes) = row
+        return ticket
+
     @staticmethod
     def convert_to_datetime(date_input):
         if isinstance(date_input, str):
@@ -53,11 +418,22 @@ class Ticket:
             return 0
 
 class ModeratorInteraction:
+    __slots__ = ('moderator_name', 'date_of_interaction', 'interaction_type')
+
     def __init__(self, moderator_name, date_of_interaction, interaction_type):
         self.moderator_name = moderator_name
         self.date_of_interaction = self.convert_to_datetime(date_of_interaction)
         self.interaction_type = interaction_type
 
+    @classmethod
+    def from_row(cls, row):
+        """
+        Builds an interaction from (moderator_name, date_of_interaction, interaction_type) as stored.
+        """
+        interaction = cls.__new__(cls)
+        interaction.moderator_name, interaction.date_of_interaction, interaction.interaction_type = row
+        return interaction
+
     @staticmethod
     def convert_to_datetime(date_input):
         if isinstance(date_input, str):
@@ -67,9 +443,142 @@ class ModeratorInteraction:
                 return None
         return date_input
 
+class CodeTable:
+    """
+    Interns repeated strings as consecutive integer codes.
+    """
+    __slots__ = ('values', 'codes')
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, codes):
+        values = self.values
+        return [values[code] for code in codes]
+
+class TicketBatch:
+    """
+    Tickets stored column by column for bulk analytics. Staff names, ticket types and the
+    handled flag are int32 codes into shared CodeTables, so the four staff columns can be
+    compared with each other directly. Dates are datetime64[D] (NaT if unparseable) and
+    response times float64 (NaN if missing).
+    """
+    __slots__ = ('ticket_numbers', 'dates', 'ticket_types', 'answered_by', 'response_times', 'claimed_by',
+                 'closed_by', 'reviewed_by', 'handled', 'notes', 'staff', 'types', 'handled_values')
+
+    def __init__(self, ticket_numbers, dates, ticket_types, answered_by, response_times, claimed_by,
+                 closed_by, reviewed_by, handled, notes, staff, types, handled_values):
+        self.ticket_numbers = ticket_numbers
+        self.dates = dates
+        self.ticket_types = ticket_types
+        self.answered_by = answered_by
+        self.response_times = response_times
+        self.claimed_by = claimed_by
+        self.closed_by = closed_by
+        self.reviewed_by = reviewed_by
+        self.handled = handled
+        self.notes = notes
+        self.staff = staff
+        self.types = types
+        self.handled_values = handled_values
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Builds a batch in one pass over tickets table rows; `rows` can be any iterable, such
+        as a cursor, so the rows never have to be held in memory all at once.
+        """
+        import numpy as np
+        staff, types, handled_values, days = CodeTable(), CodeTable(), CodeTable(), CodeTable()
+        staff_code, type_code, handled_code, day_code = staff.code, types.code, handled_values.code, days.code
+        ticket_numbers, notes = [], []
+        date_codes, type_codes, handled_codes = array('i'), array('i'), array('i')
+        answered_by, claimed_by, closed_by, reviewed_by = array('i'), array('i'), array('i'), array('i')
+        response_times = array('d')
+        nan = float('nan')
+
+        for (ticket_number, date_of_ticket, ticket_type, answered, response_time, claimed,
+             closed, reviewed, handled, note) in rows:
+            ticket_numbers.append(ticket_number)
+            date_codes.append(day_code(date_of_ticket))
+            type_codes.append(type_code(ticket_type))
+            answered_by.append(staff_code(answered))
+            response_times.append(response_time if isinstance(response_time, (int, float)) else nan)
+            claimed_by.append(staff_code(claimed))
+            closed_by.append(staff_code(closed))
+            reviewed_by.append(staff_code(reviewed))
+            handled_codes.append(handled_code(handled))
+            notes.append(note)
+
+        # Each distinct date is parsed once, then spread over the rows by its code
+        day_values = np.array([parse_batch_date(value) for value in days.values], dtype='datetime64[D]')
+        date_codes, type_codes, answered_by, claimed_by, closed_by, reviewed_by, handled_codes = (
+            np.frombuffer(column, dtype=np.int32)
+            for column in (date_codes, type_codes, answered_by, claimed_by, closed_by, reviewed_by, handled_codes))
+        return cls(ticket_numbers, day_values[date_codes], type_codes, answered_by,
+                   np.frombuffer(response_times, dtype=np.float64), claimed_by, closed_by, reviewed_by,
+                   handled_codes, notes, staff, types, handled_values)
+
+    def __len__(self):
+        return len(self.ticket_numbers)
+
+    def staff_code(self, name):
+        """
+        Code of a staff name in this batch, or -1 if it does not appear, for use in masks
+        such as `batch.answered_by == batch.staff_code('Amy')`.
+        """
+        return self.staff.codes.get(name, -1)
+
+    def select(self, mask):
+        """
+        Rows where the boolean NumPy mask is true, as a new batch sharing the code tables.
+        """
+        import numpy as np
+        indexes = np.flatnonzero(mask)
+        return TicketBatch([self.ticket_numbers[i] for i in indexes], self.dates[indexes], self.ticket_types[indexes],
+                           self.answered_by[indexes], self.response_times[indexes], self.claimed_by[indexes],
+                           self.closed_by[indexes], self.reviewed_by[indexes], self.handled[indexes],
+                           [self.notes[i] for i in indexes], self.staff, self.types, self.handled_values)
+
+    def row(self, index):
+        """
+        Row `index` decoded back into the tickets table's column order.
+        """
+        staff = self.staff.values
+        day = self.dates[index]
+        response_time = self.response_times[index]
+        return (self.ticket_numbers[index], None if day != day else str(day), self.types.values[self.ticket_types[index]],
+                staff[self.answered_by[index]], None if response_time != response_time else int(response_time),
+                staff[self.claimed_by[index]], staff[self.closed_by[index]], staff[self.reviewed_by[index]],
+                self.handled_values.values[self.handled[index]], self.notes[index])
+
+    def ticket(self, index):
+        return Ticket.from_row(self.row(index))
+
+# NumPy's datetime64 parser accepts the stored ISO dates; anything else becomes NaT
+def parse_batch_date(value):
+    return value if isinstance(value, str) and re.fullmatch(r"\d{4}-\d{2}-\d{2}", value) else 'NaT'
+
 # Create or connect to the database
+@instrumented
 def create_database():
-    conn = sqlite3.connect('staff_management.db')
+    """
+    Creates the schema, seeds the default staff, applies migrations and syncs the indexes.
+    A database already at SCHEMA_VERSION is left alone, so startup costs one PRAGMA read;
+    schema changes therefore always come with a new migration.
+    """
+    if get_schema_version() == SCHEMA_VERSION:
+        return
+
+    conn = get_connection()
     c = conn.cursor()
 
     # Create tickets and interactions table if they don't exist
@@ -98,422 +607,2252 @@ def create_database():
                     category TEXT
                 )''')
 
-    for category, names in STAFF_CATEGORIES.items():
-        for name in names:
-            c.execute("INSERT OR IGNORE INTO staff (name, category) VALUES (?, ?)", (name, category))
+    c.executemany("INSERT OR IGNORE INTO staff (name, category) VALUES (?, ?)",
+                  [(name, category) for category, names in STAFF_CATEGORIES.items() for name in names])
+
+    for statement in ROLLUP_SCHEMA + TICKET_SEARCH_SCHEMA:
+        c.execute(statement)
 
     conn.commit()
-    conn.close()
 
-# Insert ticket into the database
-def insert_ticket(ticket):
-    conn = sqlite3.connect('staff_management.db')
-    c = conn.cursor()
+    migrate_database()
+    create_indexes()
+
+# Monthly rollups behind the trend views, keyed 'YYYY-MM'. Triggers keep them current on
+# every insert, update and delete, so the trend queries read one row per month.
+TICKET_ROLLUP_ADD = '''
+    INSERT INTO ticket_monthly (month, ticket_count, response_time_sum, response_time_count)
+    SELECT substr(NEW.date_of_ticket, 1, 7), 1, coalesce(NEW.response_time, 0), NEW.response_time IS NOT NULL
+    WHERE NEW.date_of_ticket IS NOT NULL
+    ON CONFLICT (month) DO UPDATE SET
+        ticket_count = ticket_count + 1,
+        response_time_sum = response_time_sum + excluded.response_time_sum,
+        response_time_count = response_time_count + excluded.response_time_count;
+'''
+
+TICKET_ROLLUP_REMOVE = '''
+    UPDATE ticket_monthly SET
+        ticket_count = ticket_count - 1,
+        response_time_sum = response_time_sum - coalesce(OLD.response_time, 0),
+        response_time_count = response_time_count - (OLD.response_time IS NOT NULL)
+    WHERE month = substr(OLD.date_of_ticket, 1, 7);
+'''
+
+INTERACTION_ROLLUP_ADD = '''
+    INSERT INTO interaction_monthly (month, moderator_name, interaction_count)
+    SELECT substr(NEW.date_of_interaction, 1, 7), coalesce(NEW.moderator_name, ''), 1
+    WHERE NEW.date_of_interaction IS NOT NULL
+    ON CONFLICT (month, moderator_name) DO UPDATE SET interaction_count = interaction_count + 1;
+'''
+
+INTERACTION_ROLLUP_REMOVE = '''
+    UPDATE interaction_monthly SET interaction_count = interaction_count - 1
+    WHERE month = substr(OLD.date_of_interaction, 1, 7) AND moderator_name = coalesce(OLD.moderator_name, '');
+'''
+
+ROLLUP_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS ticket_monthly (
+           month TEXT PRIMARY KEY,
+           ticket_count INTEGER NOT NULL,
+           response_time_sum INTEGER NOT NULL,
+           response_time_count INTEGER NOT NULL
+       )''',
+    '''CREATE TABLE IF NOT EXISTS interaction_monthly (
+           month TEXT NOT NULL,
+           moderator_name TEXT NOT NULL,
+           interaction_count INTEGER NOT NULL,
+           PRIMARY KEY (month, moderator_name)
+       )''',
+    f"CREATE TRIGGER IF NOT EXISTS trg_tickets_rollup_insert AFTER INSERT ON tickets BEGIN {TICKET_ROLLUP_ADD} END",
+    f"CREATE TRIGGER IF NOT EXISTS trg_tickets_rollup_delete AFTER DELETE ON tickets BEGIN {TICKET_ROLLUP_REMOVE} END",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_tickets_rollup_update AFTER UPDATE OF date_of_ticket, response_time ON tickets
+        BEGIN {TICKET_ROLLUP_REMOVE} {TICKET_ROLLUP_ADD} END""",
+    f"CREATE TRIGGER IF NOT EXISTS trg_interactions_rollup_insert AFTER INSERT ON interactions BEGIN {INTERACTION_ROLLUP_ADD} END",
+    f"CREATE TRIGGER IF NOT EXISTS trg_interactions_rollup_delete AFTER DELETE ON interactions BEGIN {INTERACTION_ROLLUP_REMOVE} END",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_interactions_rollup_update AFTER UPDATE OF moderator_name, date_of_interaction ON interactions
+        BEGIN {INTERACTION_ROLLUP_REMOVE} {INTERACTION_ROLLUP_ADD} END""",
+]
 
-    if ticket.date_of_ticket:
-        ticket.date_of_ticket = Ticket.convert_to_mmddyyyy(ticket.date_of_ticket)
+# The rollups computed from scratch over the raw tables
+TICKET_ROLLUP_SOURCE = '''
+    SELECT substr(date_of_ticket, 1, 7) AS month, COUNT(*), coalesce(SUM(response_time), 0), COUNT(response_time)
+    FROM tickets WHERE date_of_ticket IS NOT NULL GROUP BY month
+'''
 
-    c.execute('''INSERT INTO tickets (ticket_number, date_of_ticket, ticket_type, answered_by,
-                                      response_time, claimed_by, closed_by, reviewed_by, handled, notes)
-                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-              (ticket.ticket_number, ticket.date_of_ticket, ticket.ticket_type, ticket.answered_by,
-               ticket.response_time, ticket.claimed_by, ticket.closed_by, ticket.reviewed_by,
-               ticket.handled, ticket.notes))
-    conn.commit()
-    conn.close()
+INTERACTION_ROLLUP_SOURCE = '''
+    SELECT substr(date_of_interaction, 1, 7) AS month, coalesce(moderator_name, '') AS moderator, COUNT(*)
+    FROM interactions WHERE date_of_interaction IS NOT NULL GROUP BY month, moderator
+'''
 
-# Insert interaction into the database
-def insert_interaction(interaction):
-    conn = sqlite3.connect('staff_management.db')
-    c = conn.cursor()
+@instrumented
+def rebuild_rollups():
+    """
+    Recomputes the monthly rollup tables from the raw tickets and interactions in one
+    transaction, e.g. after a bulk import or a manual edit outside the application.
+    """
+    conn = get_connection()
+    with conn:
+        conn.execute("DELETE FROM ticket_monthly")
+        conn.execute("INSERT INTO ticket_monthly " + TICKET_ROLLUP_SOURCE)
+        conn.execute("DELETE FROM interaction_monthly")
+        conn.execute("INSERT INTO interaction_monthly " + INTERACTION_ROLLUP_SOURCE)
+
+@instrumented
+def check_rollups():
+    """
+    Compares the rollup tables with the raw tables and returns a description of every
+    month (and moderator) where they disagree; an empty list means they are consistent.
+    """
+    conn = get_connection()
+    problems = []
+
+    expected = {row[0]: row[1:] for row in conn.execute(TICKET_ROLLUP_SOURCE)}
+    actual = {row[0]: row[1:] for row in conn.execute(
+        "SELECT month, ticket_count, response_time_sum, response_time_count FROM ticket_monthly WHERE ticket_count != 0")}
+    for month in sorted(expected.keys() | actual.keys()):
+        if expected.get(month) != actual.get(month):
+            problems.append(f"ticket_monthly {month}: expected {expected.get(month)}, found {actual.get(month)}")
+
+    expected = {row[:2]: row[2] for row in conn.execute(INTERACTION_ROLLUP_SOURCE)}
+    actual = {row[:2]: row[2] for row in conn.execute(
+        "SELECT month, moderator_name, interaction_count FROM interaction_monthly WHERE interaction_count != 0")}
+    for key in sorted(expected.keys() | actual.keys()):
+        if expected.get(key) != actual.get(key):
+            problems.append(f"interaction_monthly {key[0]} {key[1]}: expected {expected.get(key)}, found {actual.get(key)}")
+
+    return problems
+
+# Full-text index over ticket notes, types and handled flags. It is an external-content
+# FTS5 table: the text stays in tickets and the index holds only the terms, kept current by
+# triggers on tickets. Entries are keyed on the ticket rowid, which is the tickets.id
+# INTEGER PRIMARY KEY, so VACUUM cannot renumber them.
+TICKET_SEARCH_INSERT = '''INSERT INTO tickets_fts (rowid, notes, ticket_type, handled)
+                          VALUES (new.rowid, new.notes, new.ticket_type, new.handled);'''
+TICKET_SEARCH_DELETE = '''INSERT INTO tickets_fts (tickets_fts, rowid, notes, ticket_type, handled)
+                          VALUES ('delete', old.rowid, old.notes, old.ticket_type, old.handled);'''
+TICKET_SEARCH_INSERT_TRIGGER = f"CREATE TRIGGER IF NOT EXISTS trg_tickets_fts_insert AFTER INSERT ON tickets BEGIN {TICKET_SEARCH_INSERT} END"
+
+TICKET_SEARCH_SCHEMA = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tickets_fts USING fts5(notes, ticket_type, handled, content='tickets')",
+    TICKET_SEARCH_INSERT_TRIGGER,
+    f"CREATE TRIGGER IF NOT EXISTS trg_tickets_fts_delete AFTER DELETE ON tickets BEGIN {TICKET_SEARCH_DELETE} END",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_tickets_fts_update AFTER UPDATE OF notes, ticket_type, handled ON tickets
+        BEGIN {TICKET_SEARCH_DELETE} {TICKET_SEARCH_INSERT} END""",
+]
 
-    if interaction.date_of_interaction:
-        interaction.date_of_interaction = ModeratorInteraction.convert_to_mmddyyyy(interaction.date_of_interaction)
+@contextmanager
+def bulk_ticket_indexing(conn):
+    """
+    For bulk inserts: drops the per-row full-text insert trigger for the duration of the
+    block and indexes every ticket inserted meanwhile with one INSERT ... SELECT at the end.
+    New tickets always get a rowid above the current maximum, so only they are read back.
+    The block runs inside a savepoint of the caller's transaction (one is begun if none is
+    open). If it raises, everything since the savepoint is rolled back, which also restores
+    the trigger, whatever the caller then does with its transaction.
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    conn.execute("SAVEPOINT bulk_ticket_indexing")
+    try:
+        last_rowid = conn.execute("SELECT ifnull(max(rowid), 0) FROM tickets").fetchone()[0]
+        conn.execute("DROP TRIGGER IF EXISTS trg_tickets_fts_insert")
+        yield
+        conn.execute('''INSERT INTO tickets_fts (rowid, notes, ticket_type, handled)
+                        SELECT rowid, notes, ticket_type, handled FROM tickets WHERE rowid > ?''', (last_rowid,))
+        conn.execute(TICKET_SEARCH_INSERT_TRIGGER)
+    except BaseException:
+        # SQLite may already have rolled back the whole transaction, savepoint included
+        if conn.in_transaction:
+            conn.execute("ROLLBACK TO bulk_ticket_indexing")
+            conn.execute("RELEASE bulk_ticket_indexing")
+        raise
+    conn.execute("RELEASE bulk_ticket_indexing")
+
+@instrumented
+def rebuild_ticket_search():
+    """
+    Rebuilds the full-text index from the tickets table, e.g. after tickets were edited by
+    another tool while the triggers were missing.
+    """
+    conn = get_connection()
+    with conn:
+        conn.execute("INSERT INTO tickets_fts (tickets_fts) VALUES ('rebuild')")
+
+# Secondary indexes matching the search access paths. Dates are stored as ISO-8601 text,
+# so a moderator equality plus a date range is a single index range scan. The per-moderator
+# ticket indexes end with ticket_number so search pages are read in (date, number) order.
+INDEXES = {
+    'idx_tickets_date': 'tickets (date_of_ticket)',
+    'idx_tickets_answered_by_date_number': 'tickets (answered_by, date_of_ticket, ticket_number)',
+    'idx_tickets_claimed_by_date_number': 'tickets (claimed_by, date_of_ticket, ticket_number)',
+    'idx_interactions_date': 'interactions (date_of_interaction)',
+    'idx_interactions_moderator_date': 'interactions (moderator_name, date_of_interaction)',
+}
 
-    c.execute('''INSERT INTO interactions (moderator_name, date_of_interaction, interaction_type)
-                 VALUES (?, ?, ?)''',
-              (interaction.moderator_name, interaction.date_of_interaction, interaction.interaction_type))
-    conn.commit()
-    conn.close()
+def create_indexes():
+    """
+    Creates any missing index from INDEXES and drops idx_ indexes that are no longer listed.
+    """
+    conn = get_connection()
+    existing = {name for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx\\_%' ESCAPE '\\'")}
+    with conn:
+        for name in existing - INDEXES.keys():
+            conn.execute(f"DROP INDEX {name}")
+        for name, definition in INDEXES.items():
+            if name not in existing:
+                conn.execute(f"CREATE INDEX {name} ON {definition}")
+
+# Rewrite stored dates from MM/DD/YYYY (or datetime text) to ISO-8601 YYYY-MM-DD
+def migrate_to_iso_dates(conn):
+    conn.create_function('iso_date', 1, lambda value: to_iso_date(value) or value, deterministic=True)
+    conn.execute("UPDATE tickets SET date_of_ticket = iso_date(date_of_ticket) WHERE date_of_ticket IS NOT NULL")
+    conn.execute("UPDATE interactions SET date_of_interaction = iso_date(date_of_interaction) WHERE date_of_interaction IS NOT NULL")
+
+# Fill the monthly rollup tables for databases created before they existed
+def migrate_build_rollups(conn):
+    conn.execute("DELETE FROM ticket_monthly")
+    conn.execute("INSERT INTO ticket_monthly " + TICKET_ROLLUP_SOURCE)
+    conn.execute("DELETE FROM interaction_monthly")
+    conn.execute("INSERT INTO interaction_monthly " + INTERACTION_ROLLUP_SOURCE)
+
+# Index the notes of tickets stored before the full-text table existed
+def migrate_build_ticket_search(conn):
+    conn.execute("INSERT INTO tickets_fts (tickets_fts) VALUES ('rebuild')")
+
+# Fingerprint existing rows so re-imports can recognise them. Identical interactions are
+# numbered in id order, matching how normalize_batch() numbers repeated rows in a sheet.
+# Safe to run again: the columns are only added where missing and every row is recomputed.
+def migrate_add_fingerprints(conn):
+    conn.create_function('row_fingerprint', -1, row_fingerprint, deterministic=True)
+    for table in ('tickets', 'interactions'):
+        if 'fingerprint' not in {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN fingerprint BLOB")
+    conn.execute('''UPDATE tickets SET fingerprint = row_fingerprint(ticket_number, date_of_ticket, ticket_type, answered_by,
+                                                               response_time, claimed_by, closed_by, reviewed_by,
+                                                               handled, notes)''')
+    conn.execute('''UPDATE interactions SET fingerprint = row_fingerprint(moderator_name, date_of_interaction,
+                                                                    interaction_type, numbered.occurrence)
+                    FROM (SELECT id, ROW_NUMBER() OVER (PARTITION BY moderator_name, date_of_interaction, interaction_type
+                                                        ORDER BY id) - 1 AS occurrence
+                          FROM interactions) AS numbered
+                    WHERE interactions.id = numbered.id''')
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_interactions_fingerprint ON interactions (fingerprint)")
+
+# The per-moderator ticket indexes gained ticket_number; create_indexes() builds the new ones
+def migrate_ticket_page_indexes(conn):
+    conn.execute("DROP INDEX IF EXISTS idx_tickets_answered_by_date")
+    conn.execute("DROP INDEX IF EXISTS idx_tickets_claimed_by_date")
+
+# Record which workbook each interaction is imported from, so an import can tell a re-import
+# from the same event in another file. Rows already stored keep a NULL source.
+def migrate_add_interaction_sources(conn):
+    if 'source' not in {row[1] for row in conn.execute("PRAGMA table_info(interactions)")}:
+        conn.execute("ALTER TABLE interactions ADD COLUMN source TEXT")
+
+# Give tickets an INTEGER PRIMARY KEY. The implicit rowid of a table keyed on TEXT may be
+# renumbered by VACUUM, which would point the full-text index at the wrong tickets. The
+# table is rebuilt keeping every rowid as its id, so the existing index stays valid.
+def migrate_stable_ticket_ids(conn):
+    if 'id' in {row[1] for row in conn.execute("PRAGMA table_info(tickets)")}:
+        return
+    conn.execute('''CREATE TABLE tickets_rebuilt (
+                        id INTEGER PRIMARY KEY,
+                        ticket_number TEXT UNIQUE,
+                        date_of_ticket TEXT,
+                        ticket_type TEXT,
+                        answered_by TEXT,
+                        response_time INTEGER,
+                        claimed_by TEXT,
+                        closed_by TEXT,
+                        reviewed_by TEXT,
+                        handled TEXT,
+                        notes TEXT,
+                        fingerprint BLOB
+                    )''')
+    columns = ", ".join(TICKET_COLUMNS + ('fingerprint',))
+    conn.execute(f"INSERT INTO tickets_rebuilt (id, {columns}) SELECT rowid, {columns} FROM tickets")
+    # Dropping tickets also drops its indexes and triggers; create_indexes() restores the indexes
+    conn.execute("DROP TABLE tickets")
+    conn.execute("ALTER TABLE tickets_rebuilt RENAME TO tickets")
+    for statement in ROLLUP_SCHEMA + TICKET_SEARCH_SCHEMA:
+        conn.execute(statement)
+
+# Schema migrations in order; the database's PRAGMA user_version counts how many have been applied
+MIGRATIONS = [
+    migrate_to_iso_dates,
+    migrate_build_rollups,
+    migrate_build_ticket_search,
+    migrate_add_fingerprints,
+    migrate_ticket_page_indexes,
+    migrate_add_interaction_sources,
+    migrate_stable_ticket_ids,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+def get_schema_version():
+    return get_connection().execute("PRAGMA user_version").fetchone()[0]
+
+def migrate_database():
+    """
+    Applies any migrations the database has not seen yet, each in its own transaction.
+    Returns the schema versions before and after.
+    """
+    conn = get_connection()
+    start_version = get_schema_version()
+    for version, migration in enumerate(MIGRATIONS[start_version:], start=start_version + 1):
+        with conn:
+            conn.execute("BEGIN")
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+    return start_version, max(start_version, SCHEMA_VERSION)
 
 # Check if ticket number already exists
+@instrumented
 def ticket_number_exists(ticket_number):
-    conn = sqlite3.connect('staff_management.db')
-    c = conn.cursor()
+    c = get_connection().cursor()
     c.execute("SELECT 1 FROM tickets WHERE ticket_number = ?", (ticket_number,))
     result = c.fetchone()
-    conn.close()
+    c.close()
     return result is not None
 
 # Query to get all staff
+class StaffRoster:
+    """
+    In-process cache of the staff table shared by every window and by imports. Members are
+    ordered by CATEGORY_RANKS, then by any other category, then by name. The cache is
+    reloaded only after invalidate(), which add_staff() and remove_staff() call, or when
+    data_version() shows another connection has committed.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self.members = ()
+        self.categories = {}
+        self.names_by_category = {}
+        self.names = ()
+        self.ranked_names = ()
+
+    def invalidate(self):
+        with self._lock:
+            self._version = None
+
+    def refresh(self):
+        with self._lock:
+            version = data_version()
+            if version == self._version:
+                return self
+            rows = get_connection().execute("SELECT name, category FROM staff").fetchall()
+            rank = {category: index for index, category in enumerate(CATEGORY_RANKS)}
+            rows.sort(key=lambda row: (rank.get(row[1], len(rank)), row[1] or "", row[0]))
+
+            self.members = tuple(rows)
+            self.categories = dict(rows)
+            names_by_category = {}
+            for name, category in rows:
+                names_by_category.setdefault(category, []).append(name)
+            self.names_by_category = {category: tuple(names) for category, names in names_by_category.items()}
+            self.names = tuple(name for name, _ in rows)
+            self.ranked_names = tuple(name for name, category in rows if category in rank)
+            self._version = version
+            return self
+
+    def is_staff(self, name):
+        return name in self.categories
+
+_roster = StaffRoster()
+
+@instrumented
+def get_staff_roster():
+    return _roster.refresh()
+
 def get_all_staff():
-    conn = sqlite3.connect('staff_management.db')
-    c = conn.cursor()
-    c.execute("SELECT name, category FROM staff")
-    staff = c.fetchall()
-    conn.close()
-    return staff
+    return get_staff_roster().members
+
+# Add a staff member to the allowed names
+@instrumented
+def add_staff(name, category):
+    conn = get_connection()
+    with conn:
+        conn.execute("INSERT INTO staff (name, category) VALUES (?, ?)", (name, category))
+    _roster.invalidate()
+    _results.invalidate()
+
+# Remove a staff member from the allowed names
+@instrumented
+def remove_staff(name):
+    conn = get_connection()
+    with conn:
+        conn.execute("DELETE FROM staff WHERE name = ?", (name,))
+    _roster.invalidate()
+    _results.invalidate()
+
+# Most search and trend results kept by the result cache, and the most rows they may hold in total
+RESULT_CACHE_SIZE = 128
+RESULT_CACHE_ROWS = 200000
+
+# Arguments that reach the SQL through int(), so '3', '03' and 3 give the same result
+NUMERIC_ARGUMENTS = ('selected_month', 'selected_year', 'months')
+
+class ResultCache:
+    """
+    LRU cache of search and trend results shared by every window and worker thread. Entries
+    are keyed by function and normalized arguments and are only served while the database
+    is unchanged: the whole cache is dropped when data_version() shows a commit from any
+    connection, in this process or another, or when a write in this process calls
+    invalidate(). Results larger than max_rows are never cached.
+    """
+    def __init__(self, max_entries=RESULT_CACHE_SIZE, max_rows=RESULT_CACHE_ROWS):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._rows = 0
+        self._version = None
+        self._writes = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = {}
+            self.misses = {}
+            self.invalidations = 0
+
+    def invalidate(self):
+        with self._lock:
+            self._writes += 1
+
+    def current_version(self):
+        # Taken before a result is computed, so a commit that lands meanwhile only makes the entry stale
+        return (data_version(), self._writes)
+
+    def lookup(self, key, version):
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._rows = 0
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses[key[0]] = self.misses.get(key[0], 0) + 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits[key[0]] = self.hits.get(key[0], 0) + 1
+            return entry
+
+    def store(self, key, version, value):
+        # Rendered charts and other single values count as one row
+        rows = len(value) if isinstance(value, (list, tuple)) else 1
+        if rows > self.max_rows:
+            return
+        with self._lock:
+            if version != self._version or key in self._entries:
+                return
+            self._entries[key] = (value, rows)
+            self._rows += rows
+            while len(self._entries) > self.max_entries or self._rows > self.max_rows:
+                _, (_, evicted_rows) = self._entries.popitem(last=False)
+                self._rows -= evicted_rows
+
+    def stats(self):
+        with self._lock:
+            hits = sum(self.hits.values())
+            misses = sum(self.misses.values())
+            return {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'rows': self._rows,
+                'by_function': {name: {'hits': self.hits.get(name, 0), 'misses': self.misses.get(name, 0)}
+                                for name in sorted(set(self.hits) | set(self.misses))},
+            }
+
+    def prometheus_text(self):
+        stats = self.stats()
+        lines = []
+        for outcome in ('hits', 'misses'):
+            name = f"staffdata_result_cache_{outcome}_total"
+            lines.append(f"# HELP {name} Result cache {outcome}, per function")
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f'{name}{{function="{function}"}} {counts[outcome]}'
+                         for function, counts in stats['by_function'].items())
+        lines.append("# HELP staffdata_result_cache_invalidations_total Times the result cache was dropped after a write")
+        lines.append("# TYPE staffdata_result_cache_invalidations_total counter")
+        lines.append(f"staffdata_result_cache_invalidations_total {stats['invalidations']}")
+        lines.append("# HELP staffdata_result_cache_entries Results currently cached")
+        lines.append("# TYPE staffdata_result_cache_entries gauge")
+        lines.append(f"staffdata_result_cache_entries {stats['entries']}")
+        return "\n".join(lines) + "\n"
+
+_results = ResultCache()
+
+def cached_result(func):
+    """
+    Serves repeat calls of func with the same arguments from the result cache. Cached lists
+    are copied on the way out so callers may modify what they get back.
+    """
+    signature = None
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal signature
+        if signature is None:
+            # inspect is imported on first use, as it adds noticeably to startup time
+            import inspect
+            signature = inspect.signature(func)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = []
+        for name, value in bound.arguments.items():
+            if name in NUMERIC_ARGUMENTS:
+                value = int(value) if str(value).strip().isdigit() else value or None
+            arguments.append(value)
+        key = (func.__name__, *arguments)
+        try:
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+
+        version = _results.current_version()
+        entry = _results.lookup(key, version)
+        if entry is None:
+            value = func(*args, **kwargs)
+            _results.store(key, version, value)
+        else:
+            value = entry[0]
+        return list(value) if isinstance(value, list) else value
+    return wrapper
+
+def get_result_cache_stats():
+    return _results.stats()
+
+def clear_result_cache():
+    _results.invalidate()
+
+# The columns every ticket and interaction read returns, in this order. Searches name them
+# rather than selecting *, so bookkeeping columns such as the import fingerprint stay internal.
+TICKET_COLUMNS = ('ticket_number', 'date_of_ticket', 'ticket_type', 'answered_by', 'response_time',
+                  'claimed_by', 'closed_by', 'reviewed_by', 'handled', 'notes')
+INTERACTION_COLUMNS = ('id', 'moderator_name', 'date_of_interaction', 'interaction_type')
+
+# First day of the month and first day of the following month, as ISO dates
+def month_range(selected_month, selected_year):
+    month_start = datetime(int(selected_year), int(selected_month), 1)
+    next_month = datetime(month_start.year + month_start.month // 12, month_start.month % 12 + 1, 1)
+    return month_start.strftime("%Y-%m-%d"), next_month.strftime("%Y-%m-%d")
+
+def ticket_search_branches(moderator_name=None, selected_month=None, selected_year=None,
+                           columns=", ".join(TICKET_COLUMNS)):
+    """
+    The ticket search as one index range scan per role, as a list of (query, params). The
+    answered_by and claimed_by branches each use their own (name, date, number) index; the
+    second branch excludes tickets the first already returns, so their UNION ALL needs no
+    de-duplication pass.
+    """
+    date_filter = ""
+    date_params = []
+    if selected_month and selected_year:
+        date_filter = " AND date_of_ticket >= ? AND date_of_ticket < ?"
+        date_params = list(month_range(selected_month, selected_year))
+
+    return [
+        (f"SELECT {columns} FROM tickets WHERE answered_by = ?{date_filter}", [moderator_name] + date_params),
+        (f"SELECT {columns} FROM tickets WHERE claimed_by = ?{date_filter} AND answered_by IS NOT ?",
+         [moderator_name] + date_params + [moderator_name]),
+    ]
+
+def filtered_tickets_query(moderator_name=None, selected_month=None, selected_year=None,
+                           columns=", ".join(TICKET_COLUMNS)):
+    branches = ticket_search_branches(moderator_name, selected_month, selected_year, columns)
+    return " UNION ALL ".join(query for query, _ in branches), [param for _, params in branches for param in params]
+
+def filtered_interactions_query(moderator_name, selected_month=None, selected_year=None,
+                                columns=", ".join(INTERACTION_COLUMNS)):
+    query = f'''SELECT {columns} FROM interactions WHERE moderator_name = ?'''
+    params = [moderator_name]
+    if selected_month and selected_year:
+        query += " AND date_of_interaction >= ? AND date_of_interaction < ?"
+        params.extend(month_range(selected_month, selected_year))
+    return query, params
 
 # Get filtered tickets based on moderator, month, and year
+@instrumented
+@cached_result
 def get_filtered_tickets(moderator_name=None, selected_month=None, selected_year=None):
-    conn = sqlite3.connect('staff_management.db')
-    c = conn.cursor()
-    query = '''SELECT * FROM tickets WHERE (answered_by = ? OR claimed_by = ?)'''
-    params = [moderator_name, moderator_name]
-    if selected_month and selected_year:
-        query += " AND strftime('%m', date_of_ticket) = ? AND strftime('%Y', date_of_ticket) = ?"
-        params.extend([selected_month, selected_year])
-    c.execute(query, params)
+    c = get_connection().cursor()
+    c.execute(*filtered_tickets_query(moderator_name, selected_month, selected_year))
     tickets = c.fetchall()
-    conn.close()
     return tickets
 
+@instrumented
+def get_ticket_batch(moderator_name=None, selected_month=None, selected_year=None):
+    """
+    Tickets as a columnar TicketBatch for bulk work, streamed from the cursor. Without a
+    moderator every ticket is loaded, optionally limited to one month.
+    """
+    if moderator_name:
+        query, params = filtered_tickets_query(moderator_name, selected_month, selected_year)
+    else:
+        query, params = f"SELECT {', '.join(TICKET_COLUMNS)} FROM tickets", []
+        if selected_month and selected_year:
+            query += " WHERE date_of_ticket >= ? AND date_of_ticket < ?"
+            params.extend(month_range(selected_month, selected_year))
+    return TicketBatch.from_rows(get_connection().execute(query, params))
+
 # Query to get filtered interactions
+@instrumented
+@cached_result
 def get_filtered_interactions(moderator_name, selected_month, selected_year):
-    conn = sqlite3.connect('staff_management.db')
-    c = conn.cursor()
-    query = '''SELECT * FROM interactions WHERE moderator_name = ? AND 
-               strftime('%m', date_of_interaction) = ? AND 
-               strftime('%Y', date_of_interaction) = ?'''
-    c.execute(query, (moderator_name, selected_month, selected_year))
+    c = get_connection().cursor()
+    c.execute(*filtered_interactions_query(moderator_name, selected_month, selected_year))
     interactions = c.fetchall()
-    conn.close()
     return interactions
 
+# Rows fetched per page by the search result grids
+SEARCH_PAGE_SIZE = 200
+
+def paged_query(branches, date_column, key_column, after=None, limit=SEARCH_PAGE_SIZE):
+    """
+    Keyset pagination ordered by (date, key), NULL dates first, over the (query, params)
+    branches of a search. The page predicate, ORDER BY and LIMIT go into every branch, so
+    each one is read in index order and stops after `limit` rows, and the outer query only
+    merges those. `after` is the sort key of the last row already fetched, or None for the
+    first page, so every page costs the same however deep the user has scrolled.
+    """
+    page_filter, page_params = "", []
+    if after is not None:
+        after_date, after_key = after
+        if after_date is None:
+            page_filter, page_params = f" AND ({date_column} IS NOT NULL OR {key_column} > ?)", [after_key]
+        else:
+            page_filter, page_params = f" AND ({date_column}, {key_column}) > (?, ?)", [after_date, after_key]
+    order = f" ORDER BY {date_column}, {key_column} LIMIT ?"
+
+    if len(branches) == 1:
+        query, params = branches[0]
+        return query + page_filter + order, list(params) + page_params + [limit]
+    parts, params = [], []
+    for query, branch_params in branches:
+        parts.append(f"SELECT * FROM ({query}{page_filter}{order})")
+        params.extend(list(branch_params) + page_params + [limit])
+    return " UNION ALL ".join(parts) + order, params + [limit]
+
+def ticket_sort_key(ticket):
+    return (ticket[1], ticket[0])
+
+def interaction_sort_key(interaction):
+    return (interaction[2], interaction[0])
+
+@instrumented
+@cached_result
+def count_filtered_tickets(moderator_name=None, selected_month=None, selected_year=None):
+    query, params = filtered_tickets_query(moderator_name, selected_month, selected_year, columns="1")
+    return get_connection().execute(f"SELECT COUNT(*) FROM ({query})", params).fetchone()[0]
+
+@instrumented
+@cached_result
+def count_filtered_interactions(moderator_name, selected_month=None, selected_year=None):
+    query, params = filtered_interactions_query(moderator_name, selected_month, selected_year, columns="COUNT(*)")
+    return get_connection().execute(query, params).fetchone()[0]
+
+# One page of a ticket search; pass the ticket_sort_key() of the last row to get the next page
+@instrumented
+@cached_result
+def get_ticket_page(moderator_name=None, selected_month=None, selected_year=None, after=None, limit=SEARCH_PAGE_SIZE):
+    c = get_connection().cursor()
+    branches = ticket_search_branches(moderator_name, selected_month, selected_year)
+    c.execute(*paged_query(branches, 'date_of_ticket', 'ticket_number', after, limit))
+    return c.fetchall()
+
+# One page of an interaction search; pass the interaction_sort_key() of the last row to get the next page
+@instrumented
+@cached_result
+def get_interaction_page(moderator_name, selected_month=None, selected_year=None, after=None, limit=SEARCH_PAGE_SIZE):
+    c = get_connection().cursor()
+    branches = [filtered_interactions_query(moderator_name, selected_month, selected_year)]
+    c.execute(*paged_query(branches, 'date_of_interaction', 'id', after, limit))
+    return c.fetchall()
+
+def ticket_text_match(text):
+    """
+    Turns free text into an FTS5 query matching tickets that contain every word. Each word
+    is quoted, so punctuation in the search box cannot break the query syntax; a word
+    ending in * matches as a prefix.
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*')
+        if word:
+            terms.append('"' + word.replace('"', '""') + '"' + ('*' if prefix else ''))
+    return " ".join(terms)
+
+def text_search_query(text, moderator_name=None, selected_month=None, selected_year=None, after=None):
+    """
+    Builds a full-text ticket search returning the FTS5 rank (score, the bm25() value, best
+    match lowest) and rowid (doc) of every matching ticket, after the (score, doc) key
+    `after` if given. tickets is only joined when the optional moderator or month filter
+    needs its columns, and then as a CROSS JOIN: the matches drive the join, since running
+    the MATCH again for each ticket of a moderator's month is far slower. The page key
+    then reads the rowid from tickets, which defers it, and the rank it scores, until
+    the filters have passed.
+    """
+    filters = ""
+    params = [ticket_text_match(text)]
+    if moderator_name:
+        filters += " AND (tickets.answered_by = ? OR tickets.claimed_by = ?)"
+        params.extend([moderator_name, moderator_name])
+    if selected_month and selected_year:
+        filters += " AND tickets.date_of_ticket >= ? AND tickets.date_of_ticket < ?"
+        params.extend(month_range(selected_month, selected_year))
+
+    query = "SELECT tickets_fts.rank AS score, tickets_fts.rowid AS doc FROM tickets_fts"
+    doc = "tickets_fts.rowid"
+    if filters:
+        query += " CROSS JOIN tickets ON tickets.rowid = tickets_fts.rowid"
+        doc = "tickets.rowid"
+    query += " WHERE tickets_fts MATCH ?" + filters
+    if after is not None:
+        query += f" AND (tickets_fts.rank, {doc}) > (?, ?)"
+        params.extend(after)
+    return query, params
+
+# Page rows are the ticket followed by its score and rowid, which together form the page key
+def text_search_sort_key(row):
+    return (row[-2], row[-1])
+
+@instrumented
+@cached_result
+def count_text_search(text, moderator_name=None, selected_month=None, selected_year=None):
+    query, params = text_search_query(text, moderator_name, selected_month, selected_year)
+    return get_connection().execute(f"SELECT COUNT(*) FROM ({query})", params).fetchone()[0]
+
+# One page of a full-text search; pass the text_search_sort_key() of the last row to get the next page
+@instrumented
+@cached_result
+def get_text_search_page(text, moderator_name=None, selected_month=None, selected_year=None, after=None,
+                         limit=SEARCH_PAGE_SIZE):
+    """
+    Ranks the matches inside the MATCH query and limits them to one page there, so SQLite
+    keeps only the best `limit` matches while scoring and only that page's rows are joined
+    back to tickets for their columns.
+    """
+    query, params = text_search_query(text, moderator_name, selected_month, selected_year, after)
+    query += " ORDER BY tickets_fts.rank, tickets_fts.rowid LIMIT ?"
+    params.append(limit)
+    columns = ", ".join(f"tickets.{column}" for column in TICKET_COLUMNS)
+    paged = (f"SELECT {columns}, page.score, page.doc FROM ({query}) AS page "
+             "JOIN tickets ON tickets.rowid = page.doc ORDER BY page.score, page.doc")
+    return get_connection().execute(paged, params).fetchall()
+
+def explain_query_plan(query, params=()):
+    rows = get_connection().execute("EXPLAIN QUERY PLAN " + query, params).fetchall()
+    return [row[-1] for row in rows]
+
+# Searches that must be served from an index, as (label, query, params)
+def query_plan_checks():
+    return [
+        ("ticket number lookup", "SELECT 1 FROM tickets WHERE ticket_number = ?", ["T1"]),
+        ("tickets by moderator", *filtered_tickets_query("Amy")),
+        ("tickets by moderator and month", *filtered_tickets_query("Amy", "01", "2024")),
+        ("interactions by moderator", *filtered_interactions_query("Amy")),
+        ("interactions by moderator and month", *filtered_interactions_query("Amy", "01", "2024")),
+        ("ticket search page", *paged_query(ticket_search_branches("Amy", "01", "2024"), 'date_of_ticket',
+                                            'ticket_number', ("2024-01-15", "T1"))),
+        ("interaction search page", *paged_query([filtered_interactions_query("Amy", "01", "2024")],
+                                                 'date_of_interaction', 'id', ("2024-01-15", 1))),
+        ("ticket trends", *ticket_trends_query(6)),
+        ("interaction trends", *interaction_trends_query(6)),
+        ("interaction trends by moderator", *interaction_trends_query(6, "Amy")),
+    ]
+
+def check_query_plans():
+    """
+    Runs EXPLAIN QUERY PLAN over every search in query_plan_checks() and returns
+    (label, plan) for each one that falls back to scanning a whole table.
+    """
+    failures = []
+    for label, query, params in query_plan_checks():
+        plan = explain_query_plan(query, params)
+        # 'SCAN (subquery-N)' reads an already filtered intermediate result, not a table
+        if any(re.match(r"SCAN \w", step) for step in plan):
+            failures.append((label, plan))
+    return failures
+
+# Response-time target (minutes) used for the within-target share
+SLA_TARGET_MINUTES = 60
+
+# Histogram bin edges in minutes; the last bin is open-ended
+RESPONSE_TIME_BINS = [0, 5, 15, 30, 60, 120, 240]
+
+# Convert a column of response times to floats, with blanks and non-numeric values as NaN
+def to_float_array(values):
+    import numpy as np
+    try:
+        return np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        return np.array([value if isinstance(value, (int, float)) else np.nan for value in values], dtype=float)
+
+def summarize_response_times(response_times, target=SLA_TARGET_MINUTES):
+    """
+    Computes count, mean, min/max, p50/p90/p99, a histogram over RESPONSE_TIME_BINS and the
+    share of tickets answered within `target` minutes. NaN values are ignored.
+    """
+    import numpy as np
+    times = response_times[~np.isnan(response_times)]
+    if not times.size:
+        return {'count': 0, 'mean': 0.0, 'min': 0.0, 'max': 0.0, 'p50': 0.0, 'p90': 0.0, 'p99': 0.0,
+                'within_target': 0.0, 'histogram': [0] * len(RESPONSE_TIME_BINS)}
+
+    p50, p90, p99 = np.percentile(times, [50, 90, 99])
+    histogram, _ = np.histogram(times, bins=RESPONSE_TIME_BINS + [max(times.max(), RESPONSE_TIME_BINS[-1]) + 1])
+    return {
+        'count': int(times.size),
+        'mean': float(times.mean()),
+        'min': float(times.min()),
+        'max': float(times.max()),
+        'p50': float(p50),
+        'p90': float(p90),
+        'p99': float(p99),
+        'within_target': float(np.count_nonzero(times <= target) / times.size),
+        'histogram': histogram.tolist(),
+    }
+
+def summarize_by_group(groups, response_times, target=SLA_TARGET_MINUTES):
+    """
+    Response-time summaries per distinct value of `groups`, from one sort of both columns
+    rather than a filter pass per group.
+    """
+    import numpy as np
+    names, codes = np.unique(np.array(groups, dtype=str), return_inverse=True)
+    order = np.argsort(codes, kind='stable')
+    boundaries = np.searchsorted(codes[order], np.arange(len(names) + 1))
+    sorted_times = response_times[order]
+    return {str(name): summarize_response_times(sorted_times[boundaries[i]:boundaries[i + 1]], target)
+            for i, name in enumerate(names)}
+
+@instrumented
+@cached_result
+def get_response_time_stats(moderator_name=None, selected_month=None, selected_year=None, target=SLA_TARGET_MINUTES):
+    """
+    Response-time statistics for a ticket search: overall, per answering staff member and
+    per ticket type. Only the three needed columns are fetched.
+    """
+    c = get_connection().cursor()
+    c.execute(*filtered_tickets_query(moderator_name, selected_month, selected_year,
+                                      columns="response_time, answered_by, ticket_type"))
+    rows = c.fetchall()
+    response_times, answered_by, ticket_types = zip(*rows) if rows else ((), (), ())
+    response_times = to_float_array(response_times)
+
+    return {
+        'overall': summarize_response_times(response_times, target),
+        'by_staff': summarize_by_group([name or "Unknown" for name in answered_by], response_times, target),
+        'by_type': summarize_by_group([ticket_type or "Unknown" for ticket_type in ticket_types], response_times, target),
+    }
+
 # Function to calculate average response time
 def calculate_average_response_time(tickets):
-    total_response_time = 0
-    ticket_count = 0
+    if not tickets:
+        return 0
+    response_times = to_float_array([ticket[4] for ticket in tickets])
+    return summarize_response_times(response_times)['mean']
 
-    # Iterate through tickets to calculate total response time
-    for ticket in tickets:
-        response_time = ticket[5]
-        if response_time is not None and response_time != "":
-            try:
-                response_time = int(response_time)
-                total_response_time += response_time
-                ticket_count += 1
-            except ValueError:
-                print(f"Skipping invalid response time: {response_time}")
+# Ticket roles counted on the staff scorecard, as (scorecard key, tickets column)
+SCORECARD_ROLES = (('answered', 'answered_by'), ('claimed', 'claimed_by'), ('closed', 'closed_by'), ('reviewed', 'reviewed_by'))
 
-    # Calculate the average if there are valid tickets
-    if ticket_count > 0:
-        average_response_time = total_response_time / ticket_count
-    else:
-        average_response_time = 0
+def scorecard_queries(selected_month=None, selected_year=None):
+    """
+    The two reads behind the scorecard for a month, or all time: the role columns and
+    response time of every ticket in the period, and interaction counts per moderator
+    summed from the monthly rollup. Returns (ticket query, params, interaction query, params).
+    """
+    ticket_query = f"SELECT {', '.join(column for _, column in SCORECARD_ROLES)}, response_time FROM tickets"
+    interaction_query = "SELECT moderator_name, SUM(interaction_count) FROM interaction_monthly"
+    ticket_params, interaction_params = [], []
+    if selected_month and selected_year:
+        start, end = month_range(selected_month, selected_year)
+        ticket_query += " WHERE date_of_ticket >= ? AND date_of_ticket < ?"
+        ticket_params = [start, end]
+        interaction_query += " WHERE month = ?"
+        interaction_params = [start[:7]]
+    return ticket_query, ticket_params, interaction_query + " GROUP BY moderator_name", interaction_params
+
+@instrumented
+@cached_result
+def get_staff_scorecard(selected_month=None, selected_year=None, target=SLA_TARGET_MINUTES):
+    """
+    Every staff member's tickets answered, claimed, closed and reviewed, interactions, and
+    response times of the tickets they answered, for a month or all time. The tickets in
+    the period are read in a single pass, with each role column coded into an int32 array,
+    and counted with one bincount per role and one sort for the response times. GROUP BY
+    over the four roles would make SQLite sort four rows per ticket instead. Rows follow
+    the roster order, with anyone not on the roster, such as "Unknown", last.
+    """
+    import numpy as np
+    ticket_query, ticket_params, interaction_query, interaction_params = scorecard_queries(selected_month, selected_year)
+    conn = get_connection()
+    roster = get_staff_roster()
+    staff = CodeTable()
+    code = staff.code
+    for name in roster.names:
+        code(name)
+
+    columns = [array('i') for _ in SCORECARD_ROLES]
+    answered, claimed, closed, reviewed = (column.append for column in columns)
+    response_times = array('d')
+    nan = float('nan')
+    for answered_by, claimed_by, closed_by, reviewed_by, response_time in conn.execute(ticket_query, ticket_params):
+        answered(code(answered_by))
+        claimed(code(claimed_by))
+        closed(code(closed_by))
+        reviewed(code(reviewed_by))
+        response_times.append(response_time if isinstance(response_time, (int, float)) else nan)
+    interactions = {code(name): count for name, count in conn.execute(interaction_query, interaction_params)}
+
+    size = len(staff.values)
+    role_counts = [np.bincount(np.frombuffer(column, dtype=np.int32), minlength=size) for column in columns]
+    answered_codes = np.frombuffer(columns[0], dtype=np.int32)
+    order = np.argsort(answered_codes, kind='stable')
+    boundaries = np.searchsorted(answered_codes[order], np.arange(size + 1))
+    sorted_times = np.frombuffer(response_times, dtype=np.float64)[order]
+
+    rank = {name: index for index, name in enumerate(roster.names)}
+    scorecard = []
+    for index, name in enumerate(staff.values):
+        counts = [int(counts[index]) for counts in role_counts]
+        if name is None or (name not in rank and not any(counts) and not interactions.get(index)):
+            continue
+        summary = summarize_response_times(sorted_times[boundaries[index]:boundaries[index + 1]], target)
+        scorecard.append({
+            'name': name,
+            'category': roster.categories.get(name),
+            **{key: count for (key, _), count in zip(SCORECARD_ROLES, counts)},
+            'interactions': interactions.get(index, 0),
+            'mean_response': summary['mean'],
+            'p50_response': summary['p50'],
+            'p90_response': summary['p90'],
+            'within_target': summary['within_target'],
+        })
+    scorecard.sort(key=lambda row: (rank.get(row['name'], len(rank)), row['name']))
+    return scorecard
+
+# Rows written per executemany() call during an Excel import
+IMPORT_BATCH_SIZE = 1000
+
+# A ticket already stored is only rewritten when its fingerprint shows a field changed
+TICKET_UPSERT_SQL = '''INSERT INTO tickets (ticket_number, date_of_ticket, ticket_type, answered_by, response_time,
+                                             claimed_by, closed_by, reviewed_by, handled, notes, fingerprint)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT (ticket_number) DO UPDATE SET
+                           date_of_ticket = excluded.date_of_ticket, ticket_type = excluded.ticket_type,
+                           answered_by = excluded.answered_by, response_time = excluded.response_time,
+                           claimed_by = excluded.claimed_by, closed_by = excluded.closed_by,
+                           reviewed_by = excluded.reviewed_by, handled = excluded.handled, notes = excluded.notes,
+                           fingerprint = excluded.fingerprint
+                       WHERE tickets.fingerprint IS NOT excluded.fingerprint'''
+
+# Interactions have no natural key, so an interaction already imported is recognised by its
+# fingerprint. The workbook it came from is kept in `source`.
+INTERACTION_INSERT_SQL = '''INSERT INTO interactions (moderator_name, date_of_interaction, interaction_type, fingerprint, source)
+                            VALUES (?, ?, ?, ?, ?)
+                            ON CONFLICT (fingerprint) DO NOTHING'''
+
+def row_fingerprint(*values):
+    """
+    16-byte hash of a row's normalized values, stored with each imported row so a
+    re-import can tell unchanged rows from corrected ones without comparing every field.
+    """
+    return hashlib.blake2b(repr(values).encode(), digest_size=16).digest()
 
-    return average_response_time
+class ImportResult:
+    """
+    Counts of inserted, updated, skipped (unchanged or already imported) and rejected rows
+    from an Excel import, kept per sheet, plus how many rows name someone who is not on the
+    staff roster and how many interactions were already imported from another workbook.
+    """
+    def __init__(self):
+        self.sheets = {}
+
+    def sheet(self, sheet_name):
+        return self.sheets.setdefault(sheet_name, {'inserted': 0, 'updated': 0, 'skipped': 0, 'rejected': 0,
+                                                  'unknown_staff': 0, 'duplicates': 0})
+
+    @property
+    def inserted(self):
+        return sum(counts['inserted'] for counts in self.sheets.values())
+
+    @property
+    def updated(self):
+        return sum(counts['updated'] for counts in self.sheets.values())
+
+    @property
+    def skipped(self):
+        return sum(counts['skipped'] for counts in self.sheets.values())
+
+    @property
+    def rejected(self):
+        return sum(counts['rejected'] for counts in self.sheets.values())
+
+    @property
+    def unknown_staff(self):
+        return sum(counts['unknown_staff'] for counts in self.sheets.values())
+
+    @property
+    def duplicates(self):
+        return sum(counts['duplicates'] for counts in self.sheets.values())
+
+    def summary(self):
+        return "\n".join(f"{sheet_name}: {counts['inserted']} inserted, {counts['updated']} updated, {counts['skipped']} unchanged, "
+                         f"{counts['rejected']} rejected, {counts['unknown_staff']} naming unknown staff"
+                         + (f", {counts['duplicates']} duplicate across files" if counts['duplicates'] else "")
+                         for sheet_name, counts in self.sheets.items())
+
+def pad_row(row, width):
+    row = tuple(row)
+    return row + (None,) * (width - len(row)) if len(row) < width else row
+
+# Convert a Tickets sheet row and its ISO date into insert parameters, or None if the row is rejected
+def normalize_ticket_row(row, date_of_ticket):
+    row = pad_row(row, 10)
+    ticket_number = str(row[0]).strip() if row[0] else None
+    if not ticket_number or not date_of_ticket:
+        return None
 
-def upload_from_excel():
-    file_path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx")])
-    if not file_path:
+    return (
+        ticket_number,
+        date_of_ticket,
+        normalize_field(row[2], "Unknown"),
+        normalize_field(row[3], "Unknown"),
+        row[5] if isinstance(row[5], int) else 0,
+        normalize_field(row[4], "Unknown"),
+        normalize_field(row[6], "Unknown"),
+        normalize_field(row[7], "Unknown"),
+        normalize_field(row[8], "No"),
+        normalize_field(row[9], "")
+    )
+
+# Convert an Interactions sheet row and its ISO date into insert parameters, or None if the row is rejected
+def normalize_interaction_row(row, date_of_interaction):
+    row = pad_row(row, 3)
+    if not date_of_interaction:
+        return None
+
+    return (
+        normalize_field(row[0], "Unknown"),
+        date_of_interaction,
+        normalize_field(row[2], "General")
+    )
+
+def batched(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def import_rows(conn, rows, normalize, write, counts, batch_size=IMPORT_BATCH_SIZE, progress=None,
+                staff_columns=(), occurrences=None, source=None):
+    """
+    Normalizes sheet rows and writes them in batches on an open transaction with `write`.
+    Blank rows are ignored. `occurrences` is passed on to normalize_batch() for sheets whose
+    identical rows are separate events; the date layout is detected once for all the rows.
+    `source` names the workbook the rows come from.
+    `progress`, if given, is called with the number of rows read so far after every batch.
+    """
+    rows_processed = 0
+    dates = DateColumn()
+    for batch in batched(rows, batch_size):
+        records, rejected = normalize_batch(batch, normalize, occurrences, dates)
+        counts['rejected'] += rejected
+        write_batch(conn, write, records, counts, staff_columns, source)
+
+        rows_processed += len(batch)
+        if progress:
+            progress(rows_processed)
+
+def normalize_batch(batch, normalize, occurrences=None, dates=None):
+    """
+    Normalizes a batch of sheet rows, skipping blank rows, and appends each record's
+    fingerprint. With an `occurrences` dict, kept across the batches of one sheet, the
+    fingerprint also includes how many identical rows came before, so repeated events
+    stay separate rows while a re-import of the same sheet matches them one to one.
+    `dates` is the sheet's DateColumn, likewise kept across its batches.
+    Returns (records, rejected row count).
+    """
+    rows = [row for row in batch if row and any(cell is not None for cell in row)]
+    dates = (dates or DateColumn()).convert(
+        [row[IMPORT_DATE_COLUMN] if len(row) > IMPORT_DATE_COLUMN else None for row in rows])
+    records = []
+    rejected = 0
+    for row, iso_date in zip(rows, dates):
+        record = normalize(row, iso_date)
+        if record is None:
+            rejected += 1
+        elif occurrences is None:
+            records.append(record + (row_fingerprint(*record),))
+        else:
+            occurrence = occurrences.get(record, 0)
+            occurrences[record] = occurrence + 1
+            records.append(record + (row_fingerprint(*record, occurrence),))
+    return records, rejected
+
+def write_batch(conn, write, records, counts, staff_columns=(), source=None):
+    if not records:
         return
+    write(conn, records, counts, source)
+    _results.invalidate()
+    if staff_columns:
+        counts['unknown_staff'] += count_unknown_staff(records, staff_columns)
 
-    try:
-        workbook = openpyxl.load_workbook(file_path)
-
-        # Process the 'Tickets' sheet if it exists
-        if 'Tickets' in workbook.sheetnames:
-            ticket_sheet = workbook['Tickets']
-            for row in ticket_sheet.iter_rows(min_row=2, values_only=True):
-                if row:
-                    ticket_number = str(row[0]).strip() if row[0] else None
-
-                    # Skip if ticket number is missing or already exists
-                    if not ticket_number or ticket_number_exists(ticket_number):
-                        continue
-
-                    # Convert and normalize the date field
-                    date_of_ticket = convert_excel_date(row[1])
-
-                    ticket_type = normalize_field(row[2], "Unknown")
-                    answered_by = normalize_field(row[3], "Unknown")
-                    claimed_by = normalize_field(row[4], "Unknown")
-                    response_time = row[5] if isinstance(row[5], int) else 0
-                    closed_by = normalize_field(row[6], "Unknown")
-                    reviewed_by = normalize_field(row[7], "Unknown")
-                    handled = normalize_field(row[8], "No")
-                    notes = normalize_field(row[9], "")
-
-                    # Create and insert the ticket
-                    ticket = Ticket(
-                        ticket_number=ticket_number,
-                        date_of_ticket=date_of_ticket,
-                        ticket_type=ticket_type,
-                        answered_by=answered_by,
-                        claimed_by=claimed_by,
-                        response_time=response_time,
-                        closed_by=closed_by,
-                        reviewed_by=reviewed_by,
-                        handled=handled,
-                        notes=notes
-                    )
-                    insert_ticket(ticket)
-
-        # Process the 'Interactions' sheet if it exists
-        if 'Interactions' in workbook.sheetnames:
-            interaction_sheet = workbook['Interactions']
-            for row in interaction_sheet.iter_rows(min_row=2, values_only=True):
-                if row:
-                    moderator_name = normalize_field(row[0], "Unknown")
-
-                    # Convert and normalize the date field
-                    date_of_interaction = convert_excel_date(row[1])
-
-                    interaction_type = normalize_field(row[2], "General")
-
-                    # Create and insert the interaction
-                    interaction = ModeratorInteraction(
-                        moderator_name=moderator_name,
-                        date_of_interaction=date_of_interaction,
-                        interaction_type=interaction_type
-                    )
-                    insert_interaction(interaction)
-
-        messagebox.showinfo("Success", "Data uploaded successfully from Excel!")
+def write_tickets(conn, records, counts, source=None):
+    """
+    Upserts fingerprinted ticket records. The stored fingerprints of the batch's ticket
+    numbers are read first with one primary key lookup, so unchanged tickets are skipped
+    without being written and only new or corrected tickets reach the upsert. A ticket
+    number is the same ticket whichever workbook it comes from, so `source` is not used.
+    A ticket repeated within the batch is written once, as its last copy; each earlier copy
+    counts as updated by the next one if they differ and as skipped otherwise.
+    """
+    latest = {}
+    for record in records:
+        previous = latest.get(record[0])
+        if previous is not None:
+            counts['updated' if previous[-1] != record[-1] else 'skipped'] += 1
+        latest[record[0]] = record
+
+    numbers = list(latest)
+    stored = dict(conn.execute(f"SELECT ticket_number, fingerprint FROM tickets "
+                               f"WHERE ticket_number IN ({', '.join('?' * len(numbers))})", numbers))
+    changed = [record for record in latest.values() if stored.get(record[0]) != record[-1]]
+    if changed:
+        conn.executemany(TICKET_UPSERT_SQL, changed)
+    updated = sum(1 for record in changed if record[0] in stored)
+    counts['inserted'] += len(changed) - updated
+    counts['updated'] += updated
+    counts['skipped'] += len(latest) - len(changed)
+
+def write_interactions(conn, records, counts, source=None):
+    """
+    Inserts fingerprinted interaction records imported from the workbook named `source`.
+    A record whose fingerprint is already stored is not written again. It counts as
+    skipped when it came from the same workbook, or from no workbook (the app, streamed
+    events, or an import before sources were kept). When another workbook already holds
+    the same event, it counts as a duplicate across files.
+    """
+    inserted = conn.executemany(INTERACTION_INSERT_SQL, [record + (source,) for record in records]).rowcount
+    duplicates = 0
+    if inserted < len(records) and source is not None:
+        fingerprints = [record[-1] for record in records]
+        duplicates = conn.execute(f"SELECT COUNT(*) FROM interactions WHERE fingerprint IN "
+                                  f"({', '.join('?' * len(fingerprints))}) AND source != ?",
+                                  fingerprints + [source]).fetchone()[0]
+    counts['inserted'] += inserted
+    counts['duplicates'] += duplicates
+    counts['skipped'] += len(records) - inserted - duplicates
+
+# Count records naming someone who is not on the staff roster. Blank names were set to
+# "Unknown" on import, and streamed events leave fields they do not carry as None.
+def count_unknown_staff(records, staff_columns):
+    categories = get_staff_roster().categories
+    return sum(1 for record in records
+               if any(record[column] not in categories and record[column] not in (None, "Unknown")
+                      for column in staff_columns))
+
+# Both imported sheets keep their date in the second column; it is converted a batch at a time
+IMPORT_DATE_COLUMN = 1
+
+# Positions of staff names in each sheet's normalized records, checked against the roster on import
+IMPORT_STAFF_COLUMNS = {
+    'Tickets': (3, 5),
+    'Interactions': (0,),
+}
+
+# Workbook sheets that are imported: row normalizer, batch writer, and whether identical
+# rows are separate events that normalize_batch() has to number
+IMPORT_SHEETS = [
+    ('Tickets', normalize_ticket_row, write_tickets, False),
+    ('Interactions', normalize_interaction_row, write_interactions, True),
+]
+
+# Yield the data rows of a sheet (header skipped) as tuples of cell values
+def iter_sheet_rows(sheet):
+    yield from sheet.iter_rows(min_row=2, values_only=True)
 
+@instrumented
+def import_workbook(file_path, batch_size=IMPORT_BATCH_SIZE, progress=None):
+    """
+    Streams the Tickets and Interactions sheets of a workbook into the database in a single
+    transaction. The workbook is opened read-only, so rows are parsed as they are read and
+    memory stays flat regardless of file size. Tickets whose number already exists are
+    updated if any field changed and skipped otherwise, and interactions imported before
+    are skipped, so re-importing a workbook is safe. An interaction another workbook already
+    imported is kept once and counted as a duplicate across files. Rows without a ticket number or a
+    readable date are rejected.
+
+    `progress`, if given, is called as progress(sheet_name, rows_processed, total_rows);
+    total_rows is None when the workbook does not record its dimensions.
+    Returns an ImportResult.
+    """
+    import openpyxl
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    result = ImportResult()
+    conn = get_connection()
+
+    try:
+        with conn, bulk_ticket_indexing(conn):
+            for sheet_name, normalize, write, numbered in IMPORT_SHEETS:
+                if sheet_name not in workbook.sheetnames:
+                    continue
+                sheet = workbook[sheet_name]
+                total_rows = sheet.max_row - 1 if sheet.max_row else None
+                sheet_progress = None
+                if progress:
+                    sheet_progress = lambda rows_processed, name=sheet_name, total=total_rows: progress(name, rows_processed, total)
+                import_rows(conn, iter_sheet_rows(sheet), normalize, write, result.sheet(sheet_name), batch_size,
+                            sheet_progress, IMPORT_STAFF_COLUMNS[sheet_name], {} if numbered else None,
+                            os.path.basename(file_path))
+    finally:
+        workbook.close()
+
+    return result
+
+# Queue and stop flag shared with the parse worker processes, set by init_parse_worker()
+_batch_queue = None
+_stop_parsing = None
+
+def init_parse_worker(batch_queue, stop_parsing):
+    global _batch_queue, _stop_parsing
+    _batch_queue = batch_queue
+    _stop_parsing = stop_parsing
+
+def parse_workbook(file_path, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Runs in a parse worker process: reads a workbook read-only and puts normalized batches
+    on the shared queue as ('batch', file, sheet, records, rejected, rows_read), followed by
+    ('done', file, error message or None).
+    """
+    import openpyxl
+    try:
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for sheet_name, normalize, _, numbered in IMPORT_SHEETS:
+                if sheet_name not in workbook.sheetnames:
+                    continue
+                occurrences = {} if numbered else None
+                dates = DateColumn()
+                for batch in batched(iter_sheet_rows(workbook[sheet_name]), batch_size):
+                    if _stop_parsing.is_set():
+                        raise JobCancelled()
+                    records, rejected = normalize_batch(batch, normalize, occurrences, dates)
+                    _batch_queue.put(('batch', file_path, sheet_name, records, rejected, len(batch)))
+        finally:
+            workbook.close()
     except Exception as e:
-        messagebox.showerror("Error", f"Failed to upload data: {str(e)}")
+        _batch_queue.put(('done', file_path, str(e) or type(e).__name__))
+        return
+    _batch_queue.put(('done', file_path, None))
+
+@instrumented
+def import_workbooks(file_paths, workers=None, batch_size=IMPORT_BATCH_SIZE, progress=None):
+    """
+    Imports several workbooks at once. Worker processes parse and normalize the workbooks in
+    parallel and stream batches over a bounded queue to this process, the only writer, which
+    writes them in a single transaction. A ticket that appears in several files with
+    different fields ends up as whichever copy is written last.
+
+    A workbook that cannot be read is reported in the returned errors; rows it produced
+    before failing stay imported. `progress`, if given, is called as
+    progress(file_name, rows_processed, None). Returns ({file: ImportResult}, {file: error}).
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    context = multiprocessing.get_context('spawn')
+    batch_queue = context.Queue(maxsize=workers * 4)
+    stop_parsing = context.Event()
+    results = {file_path: ImportResult() for file_path in file_paths}
+    errors = {}
+    rows_processed = dict.fromkeys(file_paths, 0)
+    writers = {sheet_name: write for sheet_name, _, write, _ in IMPORT_SHEETS}
+    conn = get_connection()
+
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(file_paths)) or 1, mp_context=context,
+                                   initializer=init_parse_worker, initargs=(batch_queue, stop_parsing))
+    futures = {file_path: executor.submit(parse_workbook, file_path, batch_size) for file_path in file_paths}
+    finished = set()
+    try:
+        with conn, bulk_ticket_indexing(conn):
+            while len(finished) < len(file_paths):
+                try:
+                    message = batch_queue.get(timeout=1)
+                except queue.Empty:
+                    # A worker process that died without reporting back
+                    for file_path, future in futures.items():
+                        if file_path not in finished and future.done() and future.exception():
+                            errors[file_path] = str(future.exception())
+                            finished.add(file_path)
+                    continue
+
+                if message[0] == 'done':
+                    _, file_path, error = message
+                    finished.add(file_path)
+                    if error:
+                        errors[file_path] = error
+                    continue
+
+                _, file_path, sheet_name, records, rejected, rows_read = message
+                counts = results[file_path].sheet(sheet_name)
+                counts['rejected'] += rejected
+                write_batch(conn, writers[sheet_name], records, counts, IMPORT_STAFF_COLUMNS[sheet_name],
+                            os.path.basename(file_path))
+                rows_processed[file_path] += rows_read
+                if progress:
+                    progress(os.path.basename(file_path), rows_processed[file_path], None)
+    finally:
+        stop_parsing.set()
+        for future in futures.values():
+            future.cancel()
+        # Keep draining so no worker stays blocked on a full queue
+        while not all(future.done() for future in futures.values()):
+            try:
+                batch_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        executor.shutdown()
+
+    return results, errors
+
+class JobCancelled(Exception):
+    pass
+
+class Job:
+    """
+    Handle for a job submitted to a JobRunner. Long jobs pass report_progress as their
+    progress callback; it also raises JobCancelled once cancel() has been called, which
+    rolls back the job's open transaction.
+    """
+    def __init__(self, runner, on_done, on_error, on_progress):
+        self.runner = runner
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.future = None
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def report_progress(self, *args):
+        if self.cancelled.is_set():
+            raise JobCancelled()
+        if self.on_progress:
+            self.runner.events.put((self.on_progress, args))
+
+class JobRunner:
+    """
+    Runs database and Excel jobs off the Tk main loop. Read jobs share a small thread pool
+    and write jobs go through a single writer thread, so at most one write runs at a time.
+    Each worker thread gets its own pooled database connection. Results, errors and
+    progress are queued and delivered on the main loop by polling with root.after().
+    """
+    POLL_INTERVAL_MS = 50
+
+    def __init__(self, root, read_workers=2):
+        self.root = root
+        self.events = queue.Queue()
+        self.readers = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="staffData-read")
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="staffData-write")
+        self.jobs = set()
+        self.root.after(self.POLL_INTERVAL_MS, self.poll)
+
+    def submit(self, func, *args, write=False, on_done=None, on_error=None, on_progress=None, **kwargs):
+        """
+        Runs func(*args, **kwargs) on a worker thread. When on_progress is given, the job's
+        report_progress is passed to func as its `progress` keyword argument.
+        """
+        job = Job(self, on_done, on_error, on_progress)
+        if on_progress:
+            kwargs['progress'] = job.report_progress
+        executor = self.writer if write else self.readers
+        job.future = executor.submit(self.run, job, func, args, kwargs)
+        self.jobs.add(job)
+        return job
+
+    def run(self, job, func, args, kwargs):
+        try:
+            if job.cancelled.is_set():
+                raise JobCancelled()
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.events.put((self.finish_with_error, (job, e)))
+        else:
+            self.events.put((self.finish, (job, result)))
+
+    def finish(self, job, result):
+        self.jobs.discard(job)
+        if job.on_done and not job.cancelled.is_set():
+            job.on_done(result)
+
+    def finish_with_error(self, job, error):
+        self.jobs.discard(job)
+        if job.on_error:
+            job.on_error(error)
+        elif not isinstance(error, JobCancelled):
+            messagebox.showerror("Error", str(error))
+
+    def poll(self):
+        try:
+            while True:
+                callback, args = self.events.get_nowait()
+                try:
+                    callback(*args)
+                except tk.TclError:
+                    # The window the result was meant for has been closed
+                    pass
+                except Exception as e:
+                    # Report a failing callback the way Tk reports its own, and keep delivering
+                    self.root.report_callback_exception(type(e), e, e.__traceback__)
+        except queue.Empty:
+            pass
+        finally:
+            self.root.after(self.POLL_INTERVAL_MS, self.poll)
+
+    def shutdown(self):
+        for job in list(self.jobs):
+            job.cancel()
+        self.readers.shutdown(wait=True)
+        self.writer.shutdown(wait=True)
+
+class ProgressWindow:
+    """
+    Small window with a progress bar, a rows-processed label and a Cancel button for long
+    Excel jobs.
+    """
+    def __init__(self, parent, title, on_cancel=None):
+        self.window = tk.Toplevel(parent)
+        self.window.title(title)
+        self.label = tk.Label(self.window, text="Starting...", width=45)
+        self.label.pack(padx=10, pady=5)
+        self.bar = ttk.Progressbar(self.window, length=300, mode='determinate')
+        self.bar.pack(padx=10, pady=10)
+        self.on_cancel = on_cancel
+        tk.Button(self.window, text="Cancel", command=self.cancel).pack(pady=5)
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+
+    def cancel(self):
+        if self.on_cancel:
+            self.on_cancel()
+        self.label.config(text="Cancelling...")
+
+    def update(self, sheet_name, rows_processed, total_rows=None):
+        if total_rows:
+            self.bar.config(mode='determinate', maximum=total_rows, value=min(rows_processed, total_rows))
+            self.label.config(text=f"{sheet_name}: {rows_processed} of {total_rows} rows processed")
+        else:
+            self.bar.config(mode='indeterminate')
+            self.bar.step()
+            self.label.config(text=f"{sheet_name}: {rows_processed} rows processed")
+
+    def close(self):
+        self.window.destroy()
+
+def upload_from_excel(parent, jobs):
+    file_paths = filedialog.askopenfilenames(filetypes=[("Excel files", "*.xlsx")])
+    if not file_paths:
+        return
+
+    progress_window = ProgressWindow(parent, "Uploading from Excel")
+
+    def finished(result):
+        progress_window.close()
+        if isinstance(result, ImportResult):
+            messagebox.showinfo("Success", f"Data uploaded successfully from Excel!\n\n{result.summary()}")
+            return
+        results, errors = result
+        summary = "\n\n".join(f"{os.path.basename(file_path)}\n" + (f"Failed: {errors[file_path]}" if file_path in errors
+                                                                  else results[file_path].summary())
+                               for file_path in file_paths)
+        if errors:
+            messagebox.showwarning("Upload Finished", f"{len(errors)} of {len(file_paths)} workbooks failed.\n\n{summary}")
+        else:
+            messagebox.showinfo("Success", f"Data uploaded successfully from Excel!\n\n{summary}")
+
+    def failed(e):
+        progress_window.close()
+        if isinstance(e, JobCancelled):
+            messagebox.showinfo("Cancelled", "Upload cancelled. No rows were saved.")
+        else:
+            messagebox.showerror("Error", f"Failed to upload data: {str(e)}")
+
+    if len(file_paths) == 1:
+        job = jobs.submit(profiled, import_workbook, file_paths[0], write=True,
+                          on_done=finished, on_error=failed, on_progress=progress_window.update)
+    else:
+        job = jobs.submit(profiled, import_workbooks, list(file_paths), write=True,
+                          on_done=finished, on_error=failed, on_progress=progress_window.update)
+    progress_window.on_cancel = job.cancel
 
 def normalize_field(value, default):
     return str(value).strip() if isinstance(value, str) else default
 
-def convert_excel_date(date_value):
+# Date text layouts accepted on import, as a pattern and the positions of its year, month and day groups
+DATE_LAYOUTS = {
+    'iso': (re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})"), (0, 1, 2)),
+    'month_first': (re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})"), (2, 0, 1)),
+    'day_first': (re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})"), (2, 1, 0)),
+}
+DEFAULT_DATE_LAYOUTS = ('iso', 'month_first', 'day_first')
+DATE_CACHE_SIZE = 8192
+EXCEL_EPOCH = datetime(1899, 12, 30)
+
+def match_date_layout(text, layout):
+    pattern, (year, month, day) = DATE_LAYOUTS[layout]
+    match = pattern.fullmatch(text)
+    if match is None:
+        return None
+    parts = match.groups()
+    try:
+        return date(int(parts[year]), int(parts[month]), int(parts[day])).isoformat()
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date_text(text, layouts=DEFAULT_DATE_LAYOUTS):
     """
-    Converts various date formats from Excel to 'MM/DD/YYYY' format.
+    Parses date text with the first layout that gives a valid date. Results are cached per
+    distinct value, since thousands of rows share a few hundred days.
+    """
+    for layout in layouts:
+        iso_date = match_date_layout(text, layout)
+        if iso_date:
+            return iso_date
+    return None
+
+def detect_date_layouts(values):
+    """
+    Orders the date layouts for a column of date text by its first unambiguous slash date,
+    one where only month first or only day first gives a valid date, such as 25/12/2024.
+    Returns None if every slash date reads both ways.
+    """
+    for value in values:
+        if not isinstance(value, str):
+            continue
+        month_first = match_date_layout(value, 'month_first')
+        day_first = match_date_layout(value, 'day_first')
+        if bool(month_first) != bool(day_first):
+            layout = 'month_first' if month_first else 'day_first'
+            return ('iso', layout) + tuple(other for other in DEFAULT_DATE_LAYOUTS if other not in ('iso', layout))
+    return None
+
+def convert_excel_date(date_value, layouts=DEFAULT_DATE_LAYOUTS):
+    """
+    Converts various date formats from Excel to the ISO 'YYYY-MM-DD' format the database stores.
     """
     try:
-        if isinstance(date_value, datetime):
+        if isinstance(date_value, str):
+            return parse_date_text(date_value, layouts)
+        elif isinstance(date_value, datetime):
             # If it's a datetime object, format it directly
-            return date_value.strftime("%m/%d/%Y")
+            return date_value.strftime("%Y-%m-%d")
         elif isinstance(date_value, (int, float)):
             # If it's an Excel serial date, convert it to a date
-            excel_date = datetime(1899, 12, 30) + timedelta(days=int(date_value))
-            return excel_date.strftime("%m/%d/%Y")
-        elif isinstance(date_value, str):
-            # If it's a string, try to parse it in various formats
-            try:
-                return datetime.strptime(date_value, "%Y-%m-%d").strftime("%m/%d/%Y")
-            except ValueError:
-                pass
-            try:
-                return datetime.strptime(date_value, "%m/%d/%Y").strftime("%m/%d/%Y")
-            except ValueError:
-                pass
-            try:
-                return datetime.strptime(date_value, "%d/%m/%Y").strftime("%m/%d/%Y")
-            except ValueError:
-                return None
+            excel_date = EXCEL_EPOCH + timedelta(days=int(date_value))
+            return excel_date.strftime("%Y-%m-%d")
     except Exception as e:
         print(f"Error converting date: {date_value}, Error: {e}")
-        return None
+    return None
 
+class DateColumn:
+    """
+    The date column of one sheet, converted a batch at a time. The text layout is detected
+    once per sheet and kept for its later batches, so ambiguous dd/mm text follows the
+    layout of the column rather than defaulting to month first. Batches before the first
+    unambiguous date are read month first.
+    """
+    def __init__(self):
+        self.layouts = None
+
+    def convert(self, values):
+        if self.layouts is None:
+            self.layouts = detect_date_layouts(values)
+        layouts = self.layouts or DEFAULT_DATE_LAYOUTS
+        return [convert_excel_date(value, layouts) for value in values]
+
+# Converts a whole column of Excel date cells in one go
+def convert_date_column(values):
+    return DateColumn().convert(values)
+
+# Convert a date, datetime or date string to the ISO 'YYYY-MM-DD' text stored in the database
+def to_iso_date(date_value):
+    if isinstance(date_value, str):
+        # Also accepts 'YYYY-MM-DD HH:MM:SS' text written by older versions
+        return convert_excel_date(date_value.strip()[:10])
+    if hasattr(date_value, 'strftime'):
+        return date_value.strftime("%Y-%m-%d")
+    return None
+
+# Insert parameters for a Ticket in tickets column order, with its fingerprint last
+def ticket_values(ticket):
+    values = (ticket.ticket_number, to_iso_date(ticket.date_of_ticket), ticket.ticket_type, ticket.answered_by,
+              ticket.response_time, ticket.claimed_by, ticket.closed_by, ticket.reviewed_by, ticket.handled, ticket.notes)
+    return values + (row_fingerprint(*values),)
+
+@instrumented
 def insert_ticket(ticket):
     """
-    Inserts a ticket into the database and prints the ticket details for verification.
+    Inserts a ticket into the database.
     """
-    conn = sqlite3.connect('staff_management.db')
-    c = conn.cursor()
+    conn = get_connection()
+    with conn:
+        conn.execute('''INSERT INTO tickets (ticket_number, date_of_ticket, ticket_type, answered_by, response_time,
+                                             claimed_by, closed_by, reviewed_by, handled, notes, fingerprint)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', ticket_values(ticket))
+    _results.invalidate()
+
+def interaction_fingerprint(conn, values):
+    """
+    Fingerprint for one more interaction with these (moderator, date, type) values, numbered
+    after the identical rows already stored the way migrate_add_fingerprints() numbers them,
+    so exporting and re-importing it matches the stored row. A number freed by a deleted row
+    is never reused while a later one is still stored.
+    """
+    occurrence = conn.execute('''SELECT COUNT(*) FROM interactions WHERE moderator_name IS ?
+                                 AND date_of_interaction IS ? AND interaction_type IS ?''', values).fetchone()[0]
+    while conn.execute("SELECT 1 FROM interactions WHERE fingerprint = ?",
+                       (row_fingerprint(*values, occurrence),)).fetchone():
+        occurrence += 1
+    return row_fingerprint(*values, occurrence)
+
+@instrumented
+def insert_interaction(interaction):
+    """
+    Inserts an interaction into the database.
+    """
+    conn = get_connection()
+    values = (interaction.moderator_name, to_iso_date(interaction.date_of_interaction), interaction.interaction_type)
+    with conn:
+        conn.execute('''INSERT INTO interactions (moderator_name, date_of_interaction, interaction_type, fingerprint)
+                        VALUES (?, ?, ?, ?)''', values + (interaction_fingerprint(conn, values),))
+    _results.invalidate()
+
+# Streaming ingestion. `staffData.py ingest` reads JSON-lines events, one per line, such as
+#   {"type": "ticket", "id": "e1", "ticket_number": "T100", "date_of_ticket": "2024-05-31", "answered_by": "Amy", ...}
+#   {"type": "interaction", "id": "e2", "moderator_name": "Amy", "date_of_interaction": "05/31/2024", "interaction_type": "Warning"}
+# and answers each with a JSON-lines acknowledgement once the event is committed.
+INGEST_BATCH_SIZE = 500
+INGEST_MAX_WAIT_MS = 50
+
+# Event type: (record class, date field, sheet the counts are kept under, write function)
+INGEST_EVENT_TYPES = {
+    'ticket': (Ticket, 'date_of_ticket', 'Tickets', write_tickets),
+    'interaction': (ModeratorInteraction, 'date_of_interaction', 'Interactions', write_interactions),
+}
 
-    # Debug: Print ticket details before insertion
-    print(f"Inserting ticket: {ticket.ticket_number}, Date: {ticket.date_of_ticket}, Type: {ticket.ticket_type}")
+# SQLite stores integers as signed 64-bit values
+SQLITE_INTEGER_RANGE = range(-2 ** 63, 2 ** 63)
 
-    c.execute('''INSERT INTO tickets (ticket_number, date_of_ticket, ticket_type, answered_by,
-                                      response_time, claimed_by, closed_by, reviewed_by, handled, notes)
-                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-              (ticket.ticket_number, ticket.date_of_ticket, ticket.ticket_type, ticket.answered_by,
-               ticket.response_time, ticket.claimed_by, ticket.closed_by, ticket.reviewed_by,
-               ticket.handled, ticket.notes))
-    conn.commit()
-    conn.close()
+class EventRejected(ValueError):
+    """
+    A rejected event line. event_id is the event's "id" when the line was a JSON object
+    carrying one, so the acknowledgement can still name the event.
+    """
+    def __init__(self, message, event_id=None):
+        super().__init__(message)
+        self.event_id = event_id
 
-def insert_interaction(interaction):
+def parse_event(line):
     """
-    Inserts an interaction into the database and prints the interaction details for verification.
+    Validates one event line with the same rules as tickets and interactions entered in
+    the app and returns (event id, event type, insert parameters). Tickets are upserted on
+    their ticket number; interactions carrying an "id" are fingerprinted with it, so an
+    event delivered twice is stored once. Raises ValueError with the reason for a rejected
+    event, as an EventRejected once the event id is known.
     """
-    conn = sqlite3.connect('staff_management.db')
-    c = conn.cursor()
+    event = json.loads(line)
+    if not isinstance(event, dict):
+        raise ValueError("an event must be a JSON object")
+    fields = dict(event)
+    event_type = fields.pop('type', None)
+    event_id = fields.pop('id', None)
+    try:
+        return event_id, event_type, event_values(event_type, event_id, fields)
+    except ValueError as e:
+        raise EventRejected(str(e), event_id) from None
+
+def event_values(event_type, event_id, fields):
+    # Insert parameters for the fields of one event, or ValueError with the reason it is rejected
+    if event_type not in INGEST_EVENT_TYPES:
+        raise ValueError(f"'type' must be one of {', '.join(INGEST_EVENT_TYPES)}")
+    record_class, date_field, _, _ = INGEST_EVENT_TYPES[event_type]
+
+    unknown = set(fields) - set(record_class.__slots__)
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(sorted(unknown))}")
+    if not all(value is None or isinstance(value, (str, int, float)) for value in fields.values()):
+        raise ValueError("field values must be strings, numbers or null")
+    iso_date = convert_excel_date(fields[date_field]) if isinstance(fields.get(date_field), str) else None
+    if not iso_date:
+        raise ValueError(f"'{date_field}' must be a date such as 2024-05-31 or 05/31/2024")
+    fields[date_field] = datetime.fromisoformat(iso_date)
+    try:
+        record = record_class(**fields)
+    except TypeError:
+        raise ValueError(f"{event_type} events need {', '.join(record_class.__slots__)}") from None
+
+    if event_type == 'ticket':
+        if not isinstance(record.ticket_number, str) or not record.ticket_number.strip():
+            raise ValueError("'ticket_number' is required")
+        values = ticket_values(record)
+    else:
+        values = (record.moderator_name, iso_date, record.interaction_type)
+        # Tagged so an event id can never produce the fingerprint of an imported occurrence number
+        values += (row_fingerprint(*values, 'event', str(event_id)) if event_id is not None else None,)
+    if any(isinstance(value, int) and value not in SQLITE_INTEGER_RANGE for value in values):
+        raise ValueError("numbers must fit in a 64-bit integer")
+    return values
+
+class IngestStream:
+    """
+    One source of events and the binary output its acknowledgements are written to.
+    wait() blocks until every event submitted from the stream has been acknowledged.
+    """
+    def __init__(self, output):
+        self.output = output
+        self.pending = 0
+        self.condition = threading.Condition()
+
+    def submitted(self):
+        with self.condition:
+            self.pending += 1
+
+    def send(self, acks):
+        text = "".join(json.dumps(ack) + "\n" for ack in acks)
+        with self.condition:
+            try:
+                self.output.write(text.encode())
+                self.output.flush()
+            except (OSError, ValueError):
+                # The client went away; its events are committed all the same
+                pass
+            self.pending -= len(acks)
+            self.condition.notify_all()
 
-    # Debug: Print interaction details before insertion
-    print(f"Inserting interaction: Moderator: {interaction.moderator_name}, Date: {interaction.date_of_interaction}")
+    def wait(self):
+        with self.condition:
+            self.condition.wait_for(lambda: self.pending == 0)
 
-    c.execute('''INSERT INTO interactions (moderator_name, date_of_interaction, interaction_type)
-                 VALUES (?, ?, ?)''',
-              (interaction.moderator_name, interaction.date_of_interaction, interaction.interaction_type))
-    conn.commit()
-    conn.close()
+class IngestWriter:
+    """
+    Single writer thread for streamed events. Readers on any number of threads submit
+    event lines, which are validated on the reader's thread and queued. The writer
+    commits them in micro-batches: a batch closes after batch_size events or max_wait_ms
+    after its first event, whichever comes first, and is written in one transaction on a
+    connection with synchronous=FULL, so a single fsync makes the whole batch durable.
+    Events are acknowledged only after their batch has committed. The queue is bounded,
+    so readers block rather than buffer without limit when the writer falls behind.
+    """
+    def __init__(self, batch_size=INGEST_BATCH_SIZE, max_wait_ms=INGEST_MAX_WAIT_MS):
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = queue.Queue(maxsize=batch_size * 4)
+        self.result = ImportResult()
+        self.batches = 0
+        self.rejected = 0
+        self.errors = 0
+        self.closing = False
+        self.thread = threading.Thread(target=self.run, name="staffData-ingest", daemon=True)
+        self.thread.start()
+
+    def submit(self, stream, sequence, line):
+        try:
+            event_id, event_type, record = parse_event(line)
+            error = None
+        except ValueError as e:
+            event_id, event_type, record, error = getattr(e, 'event_id', None), None, None, str(e)
+        stream.submitted()
+        self.queue.put((stream, sequence, event_id, event_type, record, error))
+
+    def close(self):
+        """
+        Commits and acknowledges everything already submitted, then stops the writer thread.
+        """
+        self.queue.put(None)
+        self.thread.join()
+
+    def next_batch(self):
+        first = self.queue.get()
+        if first is None:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            try:
+                item = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if item is None:
+                self.closing = True
+                break
+            batch.append(item)
+        return batch
+
+    def run(self):
+        conn = get_connection()
+        conn.execute("PRAGMA synchronous = FULL")
+        while not self.closing:
+            batch = self.next_batch()
+            if not batch:
+                break
+            self.write(conn, batch)
+
+    def write(self, conn, batch):
+        records = {}
+        for _, _, _, event_type, record, error in batch:
+            if error is None:
+                records.setdefault(event_type, []).append(record)
+            else:
+                self.rejected += 1
 
-# Function to export tickets, interactions, and staff data to Excel
-def export_to_excel():
-    file_path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel files", "*.xlsx")])
-    if not file_path:
-        return
+        failure = None
+        try:
+            with conn:
+                for event_type, type_records in records.items():
+                    _, _, sheet_name, write = INGEST_EVENT_TYPES[event_type]
+                    write_batch(conn, write, type_records, self.result.sheet(sheet_name), IMPORT_STAFF_COLUMNS[sheet_name])
+        except Exception as e:
+            # Whatever fails, the batch is rolled back and answered so no client waits forever
+            failure = str(e) or type(e).__name__
+            self.errors += len(batch)
+        self.batches += 1
+
+        acks = {}
+        for stream, sequence, event_id, _, _, error in batch:
+            if error is None and failure is None:
+                ack = {'seq': sequence, 'id': event_id, 'status': 'ok'}
+            elif error is None:
+                ack = {'seq': sequence, 'id': event_id, 'status': 'error', 'error': failure}
+            else:
+                ack = {'seq': sequence, 'id': event_id, 'status': 'rejected', 'error': error}
+            acks.setdefault(stream, []).append(ack)
+        for stream, stream_acks in acks.items():
+            stream.send(stream_acks)
 
+def ingest_lines(writer, lines, stream):
+    """
+    Submits every non-blank line to the writer, numbering lines from 1 for the acknowledgements,
+    and returns once all of them have been acknowledged.
+    """
+    for sequence, line in enumerate(lines, 1):
+        if line.strip():
+            writer.submit(stream, sequence, line)
+    stream.wait()
+
+def serve_ingest(writer, port=None, socket_path=None):
+    """
+    Accepts event streams on a Unix socket or a localhost TCP port, one reader thread per
+    connection, until interrupted.
+    """
+    import socketserver
+
+    class IngestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            ingest_lines(writer, (line.decode('utf-8', 'replace') for line in self.rfile), IngestStream(self.wfile))
+
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = socketserver.ThreadingUnixStreamServer(socket_path, IngestHandler)
+    else:
+        server = socketserver.ThreadingTCPServer(('127.0.0.1', port), IngestHandler)
+    server.daemon_threads = True
+    print(f"Ingesting events on {socket_path or f'127.0.0.1:{port}'}", file=sys.stderr, flush=True)
     try:
-        workbook = openpyxl.Workbook()
-
-        # Tickets sheet
-        tickets_sheet = workbook.active
-        tickets_sheet.title = 'Tickets'
-        tickets_sheet.append(['Ticket Number', 'Date', 'Type', 'Answered By', 'Claimed By', 'Response Time', 'Closed By', 'Reviewed By', 'Handled', 'Notes'])
-
-        conn = sqlite3.connect('staff_management.db')
-        c = conn.cursor()
-
-        # Fetch and append ticket data
-        c.execute('SELECT * FROM tickets')
-        tickets = c.fetchall()
-        for ticket in tickets:
-            date_of_ticket = ticket[1]
-            if date_of_ticket:
-                try:
-                    date_obj = datetime.strptime(date_of_ticket, "%Y-%m-%d")
-                    date_of_ticket = date_obj.strftime("%m/%d/%Y")
-                except ValueError:
-                    date_of_ticket = date_of_ticket
-            
-            tickets_sheet.append([
-                ticket[0],
-                date_of_ticket,
-                ticket[2],
-                ticket[3],
-                ticket[4],
-                ticket[5],
-                ticket[6],
-                ticket[7],
-                ticket[8],
-                ticket[9]
-            ])
-
-        # Interactions sheet
-        interactions_sheet = workbook.create_sheet('Interactions')
-        interactions_sheet.append(['Moderator Name', 'Date of Interaction', 'Interaction Type'])
-
-        c.execute('SELECT * FROM interactions')
-        interactions = c.fetchall()
-        for interaction in interactions:
-            date_of_interaction = interaction[2]
-            if date_of_interaction:
-                try:
-                    date_obj = datetime.strptime(date_of_interaction, "%Y-%m-%d")
-                    date_of_interaction = date_obj.strftime("%m/%d/%Y")
-                except ValueError:
-                    date_of_interaction = date_of_interaction
-            
-            interactions_sheet.append([
-                interaction[1],
-                date_of_interaction,
-                interaction[3]
-            ])
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+# Rows fetched from the cursor per fetchmany() call during an Excel export
+EXPORT_CHUNK_SIZE = 1000
+
+TICKET_EXPORT_HEADER = ['Ticket Number', 'Date', 'Type', 'Answered By', 'Claimed By', 'Response Time', 'Closed By', 'Reviewed By', 'Handled', 'Notes']
+INTERACTION_EXPORT_HEADER = ['Moderator Name', 'Date of Interaction', 'Interaction Type']
+
+# Run a query and yield its rows, fetching them from the cursor in chunks
+def iter_query(query, params=(), chunk_size=EXPORT_CHUNK_SIZE):
+    c = get_connection().cursor()
+    try:
+        c.execute(query, params)
+        while True:
+            rows = c.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        c.close()
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def format_export_date(date_value):
+    try:
+        return datetime.strptime(date_value[:10], "%Y-%m-%d").strftime("%m/%d/%Y")
+    except (TypeError, ValueError):
+        return date_value
+
+# Build the WHERE clause for the optional export filters; end_date is inclusive
+def export_filters(date_column, moderator_columns, start_date=None, end_date=None, moderator=None):
+    conditions = []
+    params = []
+    if start_date:
+        conditions.append(f"{date_column} >= ?")
+        params.append(start_date.strftime("%Y-%m-%d"))
+    if end_date:
+        conditions.append(f"{date_column} < ?")
+        params.append((end_date + timedelta(days=1)).strftime("%Y-%m-%d"))
+    if moderator:
+        conditions.append("(" + " OR ".join(f"{column} = ?" for column in moderator_columns) + ")")
+        params.extend([moderator] * len(moderator_columns))
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    return where, params
+
+@instrumented
+def export_workbook(file_path, start_date=None, end_date=None, moderator=None,
+                    chunk_size=EXPORT_CHUNK_SIZE, progress=None):
+    """
+    Writes tickets, interactions and staff to a write-only workbook, streaming rows from
+    the cursor in fetchmany() chunks so neither the result set nor the workbook is held in
+    memory. start_date/end_date (datetimes, inclusive) and moderator narrow the tickets and
+    interactions exported; the Staff sheet is always complete.
 
-        # Staff sheet
-        staff_sheet = workbook.create_sheet('Staff')
-        staff_sheet.append(['Name', 'Category'])
+    `progress`, if given, is called as progress(sheet_name, rows_written, None).
+    Returns the number of rows written per sheet.
+    """
+    import openpyxl
+    workbook = openpyxl.Workbook(write_only=True)
+    counts = {}
+
+    def write_sheet(sheet_name, header, rows, convert):
+        sheet = workbook.create_sheet(sheet_name)
+        sheet.append(header)
+        written = 0
+        for row in rows:
+            sheet.append(convert(row))
+            written += 1
+            if progress and written % chunk_size == 0:
+                progress(sheet_name, written, None)
+        counts[sheet_name] = written
+
+    where, params = export_filters('date_of_ticket', ('answered_by', 'claimed_by'), start_date, end_date, moderator)
+    write_sheet('Tickets', TICKET_EXPORT_HEADER,
+                iter_query('''SELECT ticket_number, date_of_ticket, ticket_type, answered_by, claimed_by,
+                                     response_time, closed_by, reviewed_by, handled, notes
+                              FROM tickets''' + where, params, chunk_size),
+                lambda row: (row[0], format_export_date(row[1])) + row[2:])
+
+    where, params = export_filters('date_of_interaction', ('moderator_name',), start_date, end_date, moderator)
+    write_sheet('Interactions', INTERACTION_EXPORT_HEADER,
+                iter_query('''SELECT moderator_name, date_of_interaction, interaction_type
+                              FROM interactions''' + where, params, chunk_size),
+                lambda row: (row[0], format_export_date(row[1]), row[2]))
+
+    write_sheet('Staff', ['Name', 'Category'],
+                iter_query('SELECT name, category FROM staff', (), chunk_size), list)
+
+    workbook.save(file_path)
+    return counts
 
-        c.execute('SELECT name, category FROM staff')
-        staff = c.fetchall()
-        for member in staff:
-            staff_sheet.append(member)
+# Function to export tickets, interactions, and staff data to Excel
+def export_to_excel(parent, jobs):
+    options_window = tk.Toplevel(parent)
+    options_window.title("Export to Excel")
 
-        conn.close()
+    tk.Label(options_window, text="Start Date (MM/DD/YYYY, optional)").grid(row=0, column=0)
+    start_entry = tk.Entry(options_window)
+    start_entry.grid(row=0, column=1)
 
-        workbook.save(file_path)
-        messagebox.showinfo("Success", "Data successfully exported to Excel!")
+    tk.Label(options_window, text="End Date (MM/DD/YYYY, optional)").grid(row=1, column=0)
+    end_entry = tk.Entry(options_window)
+    end_entry.grid(row=1, column=1)
 
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to export data: {str(e)}")
+    tk.Label(options_window, text="Moderator (optional)").grid(row=2, column=0)
+    moderator_combobox = ttk.Combobox(options_window, values=get_staff_roster().names)
+    moderator_combobox.grid(row=2, column=1)
 
-# Trends and plotting functions
-def get_ticket_trends(months):
-    conn = sqlite3.connect('staff_management.db')
-    c = conn.cursor()
+    def parse_optional_date(entry):
+        value = entry.get().strip()
+        return datetime.strptime(value, "%m/%d/%Y") if value else None
 
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=months * 30)
+    def run_export():
+        try:
+            start_date = parse_optional_date(start_entry)
+            end_date = parse_optional_date(end_entry)
+        except ValueError:
+            messagebox.showerror("Error", "Dates must be in MM/DD/YYYY format.")
+            return
+        moderator = moderator_combobox.get().strip() or None
 
-    query = '''
-        SELECT strftime('%m-%Y', date_of_ticket) AS month, COUNT(*), AVG(response_time)
-        FROM tickets
-        WHERE date_of_ticket BETWEEN ? AND ?
-        GROUP BY month
-        ORDER BY month
-    '''
-    c.execute(query, (start_date.strftime('%m-%d-%Y'), end_date.strftime('%m-%d-%Y')))
-    ticket_data = c.fetchall()
-    conn.close()
+        file_path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel files", "*.xlsx")])
+        if not file_path:
+            return
+        options_window.destroy()
 
-    return ticket_data
+        progress_window = ProgressWindow(parent, "Exporting to Excel")
 
-def get_interaction_trends(months, moderator=None):
-    conn = sqlite3.connect('staff_management.db')
-    c = conn.cursor()
+        def finished(counts):
+            progress_window.close()
+            messagebox.showinfo("Success", "Data successfully exported to Excel!")
+
+        def failed(e):
+            progress_window.close()
+            if isinstance(e, JobCancelled):
+                messagebox.showinfo("Cancelled", "Export cancelled.")
+            else:
+                messagebox.showerror("Error", f"Failed to export data: {str(e)}")
+
+        job = jobs.submit(profiled, export_workbook, file_path, start_date, end_date, moderator,
+                          on_done=finished, on_error=failed, on_progress=progress_window.update)
+        progress_window.on_cancel = job.cancel
 
+    tk.Button(options_window, text="Export", command=run_export).grid(row=3, column=0, columnspan=2, pady=10)
+
+# Trends and plotting functions
+# First and last 'YYYY-MM' month keys of a trend window covering the last `months` months
+def trend_month_range(months):
     end_date = datetime.now()
     start_date = end_date - timedelta(days=months * 30)
+    return start_date.strftime('%Y-%m'), end_date.strftime('%Y-%m')
+
+def ticket_trends_query(months):
+    query = '''
+        SELECT month, ticket_count, CAST(response_time_sum AS REAL) / NULLIF(response_time_count, 0)
+        FROM ticket_monthly
+        WHERE month >= ? AND month <= ? AND ticket_count > 0
+        ORDER BY month
+    '''
+    return query, list(trend_month_range(months))
 
+def interaction_trends_query(months, moderator=None):
     query = '''
-        SELECT strftime('%m-%Y', date(date_of_interaction, 'start of month')) AS month, COUNT(*)
-        FROM interactions
-        WHERE date(date_of_interaction) BETWEEN ? AND ?
+        SELECT month, SUM(interaction_count)
+        FROM interaction_monthly
+        WHERE month >= ? AND month <= ?
     '''
-    params = [start_date.strftime('%m/%d/%Y'), end_date.strftime('%m/%d/%Y')]
+    params = list(trend_month_range(months))
 
     if moderator:
         query += ' AND moderator_name = ?'
         params.append(moderator)
 
-    query += ' GROUP BY month ORDER BY month'
-    c.execute(query, params)
-    interaction_data = c.fetchall()
-    conn.close()
-
-    return interaction_data
+    query += ' GROUP BY month HAVING SUM(interaction_count) > 0 ORDER BY month'
+    return query, params
 
-def show_ticket_trends(months):
-    ticket_data = get_ticket_trends(months)
-    
-    if not ticket_data:
-        messagebox.showinfo("No Data", "No ticket data available for the selected period.")
-        return
+# Trends are read from the monthly rollup tables rather than aggregated from the raw rows
+@instrumented
+@cached_result
+def get_ticket_trends(months):
+    c = get_connection().cursor()
+    c.execute(*ticket_trends_query(months))
+    ticket_data = c.fetchall()
 
-    months = [data[0] for data in ticket_data]
-    ticket_counts = [data[1] for data in ticket_data]
-    avg_response_times = [data[5] for data in ticket_data]
+    return ticket_data
 
-    fig, ax1 = plt.subplots()
+@instrumented
+@cached_result
+def get_interaction_trends(months, moderator=None):
+    c = get_connection().cursor()
+    c.execute(*interaction_trends_query(months, moderator))
+    interaction_data = c.fetchall()
 
-    ax1.set_xlabel('Month')
-    ax1.set_ylabel('Number of Tickets', color='tab:blue')
-    ax1.plot(months, ticket_counts, color='tab:blue', label='Number of Tickets')
-    ax1.tick_params(axis='y', labelcolor='tab:blue')
+    return interaction_data
 
-    ax2 = ax1.twinx()
-    ax2.set_ylabel('Average Response Time (mins)', color='tab:red')
-    ax2.plot(months, avg_response_times, color='tab:red', label='Average Response Time')
-    ax2.tick_params(axis='y', labelcolor='tab:red')
+# Rendered trend charts are CHART_SIZE inches at CHART_DPI, shown beside the main buttons
+CHART_SIZE = (6.4, 4.4)
+CHART_DPI = 100
 
-    fig.tight_layout()
-    plt.title(f'Ticket Trends for Last {months} Months')
-    plt.show()
+class TrendChart:
+    """
+    A reusable off-screen figure for one kind of trend chart. The figure, axes and lines
+    are built once on the Agg canvas; each render only swaps the line data, tick labels
+    and title in place and writes a PNG, instead of building a new pyplot figure.
+    """
+    def __init__(self, kind):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        self.figure = Figure(figsize=CHART_SIZE, dpi=CHART_DPI)
+        FigureCanvasAgg(self.figure)
+        self.figure.subplots_adjust(left=0.12, right=0.86, top=0.9, bottom=0.2)
+        axis = self.figure.add_subplot()
+        axis.set_xlabel('Month')
+        if kind == 'tickets':
+            response_axis = axis.twinx()
+            self.axes = [axis, response_axis]
+            self.lines = [axis.plot([], [], color='tab:blue', marker='o')[0],
+                          response_axis.plot([], [], color='tab:red', marker='o')[0]]
+            axis.set_ylabel('Number of Tickets', color='tab:blue')
+            axis.tick_params(axis='y', labelcolor='tab:blue')
+            response_axis.set_ylabel('Average Response Time (mins)', color='tab:red')
+            response_axis.tick_params(axis='y', labelcolor='tab:red')
+        else:
+            self.axes = [axis]
+            self.lines = [axis.plot([], [], color='tab:green', marker='o')[0]]
+            axis.set_ylabel('Number of Interactions')
+
+    def render(self, title, months, *series):
+        positions = range(len(months))
+        for axis, line, values in zip(self.axes, self.lines, series):
+            line.set_data(positions, [float('nan') if value is None else value for value in values])
+            axis.relim()
+            axis.autoscale_view()
+        self.axes[0].set_xlim(-0.5, len(months) - 0.5)
+        self.axes[0].set_xticks(positions, months, rotation=45)
+        self.axes[0].set_title(title)
+        output = io.BytesIO()
+        self.figure.savefig(output, format='png')
+        return output.getvalue()
+
+# One figure per chart kind, shared by every render; matplotlib figures are not thread-safe
+_trend_charts = {}
+_chart_lock = threading.Lock()
+
+@instrumented
+@cached_result
+def render_trend_chart(kind, months, moderator=None):
+    """
+    PNG of the ticket or interaction trend over the last `months` months, or None when the
+    period has no data. Charts are rendered on the calling worker thread and kept in the
+    result cache, so a chart already seen for the same period, moderator and database
+    version is returned without touching the database or matplotlib.
+    """
+    if kind == 'tickets':
+        trend_data = get_ticket_trends(months)
+        title = f'Ticket Trends for Last {months} Months'
+    else:
+        trend_data = get_interaction_trends(months, moderator)
+        title = f'Interaction Trends for Last {months} Months' + (f' (Moderator: {moderator})' if moderator else '')
+    if not trend_data:
+        return None
 
-def show_interaction_trends(months, moderator=None):
-    interaction_data = get_interaction_trends(months, moderator)
-    
-    if not interaction_data:
-        messagebox.showinfo("No Data", "No interaction data available for the selected period.")
-        return
+    with _chart_lock:
+        chart = _trend_charts.get(kind)
+        if chart is None:
+            chart = _trend_charts[kind] = TrendChart(kind)
+        # Columns after the month are (count,) for interactions and (count, average response time) for tickets
+        return chart.render(title, *zip(*trend_data))
 
-    months = [data[0] for data in interaction_data]
-    interaction_counts = [data[1] for data in interaction_data]
+class ChartPanel:
+    """
+    Area beside the main buttons where trend charts are shown. Charts arrive as PNG bytes
+    from render_trend_chart() and are displayed with a Tk PhotoImage, so showing one does
+    no matplotlib work on the main loop.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.frame = tk.Frame(root)
+        self.label = tk.Label(self.frame)
+        self.label.pack()
+        tk.Button(self.frame, text="Close Chart", command=self.hide).pack(pady=5)
+        self.image = None
+        self.window_size = None
+
+    def show(self, png):
+        # The PhotoImage must stay referenced for as long as it is displayed
+        self.image = tk.PhotoImage(data=png)
+        self.label.config(image=self.image)
+        if self.window_size is None:
+            # Grow the window to fit the chart, and restore its size when the chart is closed
+            self.window_size = f"{self.root.winfo_width()}x{self.root.winfo_height()}"
+            self.frame.pack(side=tk.LEFT, anchor=tk.N, padx=10, pady=10)
+            self.root.geometry("")
+
+    def hide(self):
+        self.frame.pack_forget()
+        self.label.config(image="")
+        self.image = None
+        if self.window_size:
+            self.root.geometry(self.window_size)
+            self.window_size = None
+
+# Format an ISO date as 'January 5, 2024' for display
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def format_display_date(date_str):
+    try:
+        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
+        return f"{date_obj.strftime('%B')} {date_obj.day}, {date_obj.year}"
+    except (TypeError, ValueError):
+        return date_str
 
-    plt.figure()
-    plt.plot(months, interaction_counts, color='tab:green', label='Number of Interactions')
-    plt.xlabel('Month')
-    plt.ylabel('Number of Interactions')
-    plt.title(f'Interaction Trends for Last {months} Months' + (f' (Moderator: {moderator})' if moderator else ''))
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+class PagedResultView:
+    """
+    Search result grid that fetches one page of rows at a time as the user scrolls
+    towards the end, so only the rows actually shown are fetched and formatted. Pages are
+    fetched on the JobRunner's worker threads.
+    """
+    def __init__(self, parent, jobs, columns, fetch_page, row_values, row_key, total):
+        self.jobs = jobs
+        self.fetch_page = fetch_page
+        self.row_values = row_values
+        self.row_key = row_key
+        self.total = total
+        self.loaded = 0
+        self.last_key = None
+        self.loading = False
+
+        frame = tk.Frame(parent)
+        frame.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(frame, columns=columns, show='headings')
+        for column in columns:
+            self.tree.heading(column, text=column)
+        self.scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_scroll)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.status = tk.Label(parent, text="Loading...")
+        self.status.pack()
+        self.load_next_page()
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if float(last) >= 0.9 and self.loaded < self.total and not self.loading:
+            self.load_next_page()
+
+    def load_next_page(self):
+        self.loading = True
+        self.jobs.submit(self.fetch_page, self.last_key, on_done=self.add_page, on_error=self.page_failed)
+
+    def page_failed(self, error):
+        # Scrolling again retries the same page
+        self.loading = False
+        if isinstance(error, JobCancelled):
+            return
+        self.status.config(text=f"Showing {self.loaded} of {self.total} - loading more failed, scroll to retry")
+        messagebox.showerror("Error", f"Could not load more results: {error}")
+
+    def add_page(self, rows):
+        for row in rows:
+            self.tree.insert('', 'end', values=self.row_values(row))
+        if rows:
+            self.last_key = self.row_key(rows[-1])
+        else:
+            # Rows were deleted since the count was taken
+            self.total = self.loaded
+        self.loaded += len(rows)
+        self.status.config(text=f"Showing {self.loaded} of {self.total}")
+        self.loading = False
 
 # GUI Application
 class TicketApp:
@@ -525,9 +2864,13 @@ class TicketApp:
         # Create or connect to the database
         create_database()
 
+        # Worker threads for searches, trends, imports and exports
+        self.jobs = JobRunner(self.root)
+
         # Create the main frame
         self.main_frame = tk.Frame(self.root)
-        self.main_frame.pack(padx=10, pady=10)
+        self.main_frame.pack(side=tk.LEFT, expand=True, anchor=tk.N, padx=10, pady=10)
+        self.chart_panel = ChartPanel(self.root)
 
         # Create buttons on the main page
         tk.Label(self.main_frame, text="Staff Management System", font=("Ariel", 16)).pack(pady=10)
@@ -542,8 +2885,10 @@ class TicketApp:
         tk.Button(self.main_frame, text="View Interaction Trends (3 months)", width=30, command=lambda: self.view_interaction_trends(3)).pack(pady=5)
         tk.Button(self.main_frame, text="View Interaction Trends (6 months)", width=30, command=lambda: self.view_interaction_trends(6)).pack(pady=5)
         tk.Button(self.main_frame, text="Manage Allowed Names", width=20, command=self.manage_allowed_names).pack(pady=5)
-        tk.Button(self.main_frame, text="Upload from Excel", width=20, command=upload_from_excel).pack(pady=5)
-        tk.Button(self.main_frame, text="Export to Excel", width=20, command=export_to_excel).pack(pady=5)
+        tk.Button(self.main_frame, text="Upload from Excel", width=20, command=lambda: upload_from_excel(self.root, self.jobs)).pack(pady=5)
+        tk.Button(self.main_frame, text="Export to Excel", width=20, command=lambda: export_to_excel(self.root, self.jobs)).pack(pady=5)
+        tk.Button(self.main_frame, text="Staff Scorecard", width=20, command=self.show_scorecard).pack(pady=5)
+        tk.Button(self.main_frame, text="Diagnostics", width=20, command=self.show_diagnostics).pack(pady=5)
 
     def prompt_ticket_number(self):
         ticket_window = tk.Toplevel(self.root)
@@ -583,7 +2928,7 @@ class TicketApp:
         ticket_type = tk.Entry(ticket_window)
         ticket_type.grid(row=2, column=1)
 
-        staff = [name for name, _ in get_all_staff()]
+        staff = get_staff_roster().names
 
         tk.Label(ticket_window, text="Answered By").grid(row=3, column=0)
         answered_by = ttk.Combobox(ticket_window, values=staff)
@@ -636,7 +2981,7 @@ class TicketApp:
         interaction_window = tk.Toplevel(self.root)
         interaction_window.title("Enter New Interaction")
 
-        staff = [name for name, category in get_all_staff() if category in CATEGORY_RANKS]
+        staff = get_staff_roster().ranked_names
 
         tk.Label(interaction_window, text="Moderator Name").grid(row=0, column=0)
         moderator_name = ttk.Combobox(interaction_window, values=staff)
@@ -666,7 +3011,7 @@ class TicketApp:
         search_window = tk.Toplevel(self.root)
         search_window.title("Search Tickets")
 
-        staff = [name for name, _ in get_all_staff()]
+        staff = get_staff_roster().names
 
         tk.Label(search_window, text="Moderator Name").grid(row=0, column=0)
         self.moderator_name = ttk.Combobox(search_window, values=staff)
@@ -682,51 +3027,95 @@ class TicketApp:
         self.year_combobox = ttk.Combobox(search_window, values=years, state="readonly")
         self.year_combobox.grid(row=2, column=1)
 
-        tk.Button(search_window, text="Search", command=self.perform_ticket_search).grid(row=3, column=0, columnspan=2, pady=10)
+        tk.Label(search_window, text="Notes Contain").grid(row=3, column=0)
+        self.search_text = tk.Entry(search_window)
+        self.search_text.grid(row=3, column=1)
+
+        tk.Button(search_window, text="Search", command=self.perform_ticket_search).grid(row=4, column=0, columnspan=2, pady=10)
 
     def perform_ticket_search(self):
         moderator = self.moderator_name.get().strip()
         selected_month = self.month_combobox.get().strip()
         selected_year = self.year_combobox.get().strip()
+        text = self.search_text.get().strip()
+        if ticket_text_match(text):
+            self.jobs.submit(count_text_search, text, moderator, selected_month, selected_year,
+                             on_done=lambda total: self.show_text_search_results(text, moderator, selected_month, selected_year, total))
+            return
+
+        def search():
+            return (count_filtered_tickets(moderator, selected_month, selected_year),
+                    get_response_time_stats(moderator, selected_month, selected_year))
 
-        tickets = get_filtered_tickets(moderator_name=moderator, selected_month=selected_month, selected_year=selected_year)
+        self.jobs.submit(search, on_done=lambda result: self.show_ticket_results(moderator, selected_month, selected_year, *result))
 
-        if not tickets:
+    def show_ticket_results(self, moderator, selected_month, selected_year, total, stats):
+        if not total:
             messagebox.showinfo("No Results", "No tickets found for the given criteria.")
             return
 
         result_window = tk.Toplevel(self.root)
-        result_window.title(f"Search Results - Total: {len(tickets)} Tickets")
-
-        tree = ttk.Treeview(result_window, columns=('Ticket Number', 'Date', 'Type', 'Answered By', 'Claimed By', 'Response Time', 'Notes'), show='headings')
-        tree.heading('Ticket Number', text='Ticket Number')
-        tree.heading('Date', text='Date')
-        tree.heading('Type', text='Type')
-        tree.heading('Answered By', text='Answered By')
-        tree.heading('Claimed By', text='Claimed By')
-        tree.heading('Response Time', text='Response Time')
-        tree.heading('Notes', text='Notes')
-        tree.pack(fill=tk.BOTH, expand=True)
-
-        for ticket in tickets:
-            date_str = ticket[1]
-            try:
-                date_obj = datetime.strptime(date_str, "%m/%d/%Y")
-                month_name = date_obj.strftime("%B")
-                formatted_date = f"{month_name} {date_obj.day}, {date_obj.year}"
-            except ValueError:
-                formatted_date = date_str
-
-            tree.insert('', 'end', values=(ticket[0], formatted_date, ticket[2], ticket[3], ticket[5], ticket[4], ticket[9]))
+        result_window.title(f"Search Results - Total: {total} Tickets")
+
+        PagedResultView(
+            result_window,
+            self.jobs,
+            ('Ticket Number', 'Date', 'Type', 'Answered By', 'Claimed By', 'Response Time', 'Notes'),
+            lambda after: get_ticket_page(moderator, selected_month, selected_year, after),
+            lambda ticket: (ticket[0], format_display_date(ticket[1]), ticket[2], ticket[3], ticket[5], ticket[4], ticket[9]),
+            ticket_sort_key,
+            total
+        )
+
+        tk.Label(result_window, text=f"Average Response Time: {stats['overall']['mean']:.2f} mins").pack()
+        self.show_response_time_stats(result_window, stats)
+
+    def show_text_search_results(self, text, moderator, selected_month, selected_year, total):
+        if not total:
+            messagebox.showinfo("No Results", f"No tickets mention '{text}'.")
+            return
 
-        average_response_time = calculate_average_response_time(tickets)
-        tk.Label(result_window, text=f"Average Response Time: {average_response_time:.2f} mins").pack()
+        result_window = tk.Toplevel(self.root)
+        result_window.title(f"Tickets Mentioning '{text}' - Total: {total} Tickets")
+
+        PagedResultView(
+            result_window,
+            self.jobs,
+            ('Ticket Number', 'Date', 'Type', 'Answered By', 'Claimed By', 'Handled', 'Notes'),
+            lambda after: get_text_search_page(text, moderator, selected_month, selected_year, after),
+            lambda ticket: (ticket[0], format_display_date(ticket[1]), ticket[2], ticket[3], ticket[5], ticket[8], ticket[9]),
+            text_search_sort_key,
+            total
+        )
+
+    def show_response_time_stats(self, parent, stats):
+        overall = stats['overall']
+        tk.Label(parent, text=(f"p50: {overall['p50']:.0f}  p90: {overall['p90']:.0f}  p99: {overall['p99']:.0f}  "
+                               f"min: {overall['min']:.0f}  max: {overall['max']:.0f} mins  |  "
+                               f"within {SLA_TARGET_MINUTES} mins: {overall['within_target']:.0%}")).pack()
+
+        bin_labels = [f"{low}-{high}" for low, high in zip(RESPONSE_TIME_BINS, RESPONSE_TIME_BINS[1:])] + [f"{RESPONSE_TIME_BINS[-1]}+"]
+        tk.Label(parent, text="Histogram (mins): " + "  ".join(
+            f"{label}: {count}" for label, count in zip(bin_labels, overall['histogram']))).pack()
+
+        columns = ('Group', 'Tickets', 'Mean', 'p50', 'p90', 'p99', 'Within Target')
+        breakdown = ttk.Treeview(parent, columns=columns, show='headings', height=8)
+        for column in columns:
+            breakdown.heading(column, text=column)
+            breakdown.column(column, width=90)
+        breakdown.pack(fill=tk.BOTH, expand=True)
+
+        for group_label, groups in (("Staff", stats['by_staff']), ("Type", stats['by_type'])):
+            for name, summary in groups.items():
+                breakdown.insert('', 'end', values=(f"{group_label}: {name}", summary['count'], f"{summary['mean']:.1f}",
+                                                    f"{summary['p50']:.0f}", f"{summary['p90']:.0f}", f"{summary['p99']:.0f}",
+                                                    f"{summary['within_target']:.0%}"))
 
     def search_interactions(self):
         search_window = tk.Toplevel(self.root)
         search_window.title("Search Interactions")
 
-        staff = [name for name, _ in get_all_staff()]
+        staff = get_staff_roster().names
 
         tk.Label(search_window, text="Moderator Name").grid(row=0, column=0)
         self.moderator_name = ttk.Combobox(search_window, values=staff)
@@ -749,53 +3138,46 @@ class TicketApp:
         selected_month = self.month_combobox.get().strip()
         selected_year = self.year_combobox.get().strip()
 
-        interactions = get_filtered_interactions(moderator, selected_month, selected_year)
+        self.jobs.submit(count_filtered_interactions, moderator, selected_month, selected_year,
+                         on_done=lambda total: self.show_interaction_results(moderator, selected_month, selected_year, total))
 
-        if not interactions:
+    def show_interaction_results(self, moderator, selected_month, selected_year, total):
+        if not total:
             messagebox.showinfo("No Results", "No interactions found for the given criteria.")
             return
 
         result_window = tk.Toplevel(self.root)
-        result_window.title(f"Search Results - Total: {len(interactions)} Interactions")
-
-        tree = ttk.Treeview(result_window, columns=('Moderator', 'Date', 'Type'), show='headings')
-        tree.heading('Moderator', text='Moderator')
-        tree.heading('Date', text='Date')
-        tree.heading('Type', text='Type')
-        tree.pack(fill=tk.BOTH, expand=True)
-
-        for interaction in interactions:
-            tree.insert('', 'end', values=(interaction[1], interaction[2], interaction[3]))
-
-        tk.Label(result_window, text=f"Total Interactions: {len(interactions)}").pack()
-
-        self.show_interaction_trend_graph(moderator)
-
-    def show_interaction_trend_graph(self, moderator):
-        interaction_data = get_interaction_trends(6, moderator)
-
-        if not interaction_data:
-            messagebox.showinfo("No Trend Data", f"No interaction trend data available for {moderator}.")
-            return
-
-        months = [data[0] for data in interaction_data]
-        interaction_counts = [data[1] for data in interaction_data]
+        result_window.title(f"Search Results - Total: {total} Interactions")
+
+        PagedResultView(
+            result_window,
+            self.jobs,
+            ('Moderator', 'Date', 'Type'),
+            lambda after: get_interaction_page(moderator, selected_month, selected_year, after),
+            lambda interaction: (interaction[1], format_export_date(interaction[2]), interaction[3]),
+            interaction_sort_key,
+            total
+        )
+
+        tk.Label(result_window, text=f"Total Interactions: {total}").pack()
+
+        self.show_trend_chart('interactions', 6, moderator)
+
+    def show_trend_chart(self, kind, months, moderator=None):
+        def shown(png):
+            if png is None:
+                messagebox.showinfo("No Data", f"No {kind[:-1]} trend data available for the selected period"
+                                               + (f" for {moderator}." if moderator else "."))
+            else:
+                self.chart_panel.show(png)
 
-        plt.figure()
-        plt.plot(months, interaction_counts, color='tab:green', marker='o', label=f'Interactions for {moderator}')
-        plt.xlabel('Month')
-        plt.ylabel('Number of Interactions')
-        plt.title(f'Interaction Trends (Last 6 Months) for {moderator}')
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.legend()
-        plt.show()
+        self.jobs.submit(render_trend_chart, kind, months, moderator, on_done=shown)
 
     def view_ticket_trends(self, months):
-        show_ticket_trends(months)
+        self.show_trend_chart('tickets', months)
 
     def view_interaction_trends(self, months):
-        show_interaction_trends(months)
+        self.show_trend_chart('interactions', months)
 
     def manage_allowed_names(self):
         name_window = tk.Toplevel(self.root)
@@ -821,11 +3203,7 @@ class TicketApp:
             new_name = name_entry.get().strip()
             selected_category = category_combobox.get().strip()
             if new_name and selected_category:
-                conn = sqlite3.connect('staff_management.db')
-                c = conn.cursor()
-                c.execute("INSERT INTO staff (name, category) VALUES (?, ?)", (new_name, selected_category))
-                conn.commit()
-                conn.close()
+                add_staff(new_name, selected_category)
                 allowed_names_list.insert(tk.END, f"{new_name} - {selected_category}")
                 name_entry.delete(0, tk.END)
 
@@ -835,18 +3213,610 @@ class TicketApp:
                 name, category = selected_name.split(" - ")
                 confirm = messagebox.askyesno("Confirm Removal", f"Are you sure you want to remove '{name}' from '{category}'?")
                 if confirm:
-                    conn = sqlite3.connect('staff_management.db')
-                    c = conn.cursor()
-                    c.execute("DELETE FROM staff WHERE name = ?", (name,))
-                    conn.commit()
-                    conn.close()
+                    remove_staff(name)
                     allowed_names_list.delete(tk.ACTIVE)
                     messagebox.showinfo("Success", f"{name} has been removed from {category}.")
 
         tk.Button(name_window, text="Add", command=add_name).grid(row=4, column=0)
         tk.Button(name_window, text="Remove", command=remove_name).grid(row=4, column=1)
 
-if __name__ == "__main__":
+    def show_scorecard(self):
+        scorecard_window = tk.Toplevel(self.root)
+        scorecard_window.title("Staff Scorecard")
+        scorecard_window.geometry("1000x500")
+
+        filters = tk.Frame(scorecard_window)
+        filters.pack(pady=5)
+        tk.Label(filters, text="Month").pack(side=tk.LEFT)
+        month_combobox = ttk.Combobox(filters, values=[""] + [str(i).zfill(2) for i in range(1, 13)], state="readonly", width=5)
+        month_combobox.pack(side=tk.LEFT, padx=3)
+        tk.Label(filters, text="Year").pack(side=tk.LEFT)
+        year_combobox = ttk.Combobox(filters, values=[""] + [str(year) for year in range(2023, datetime.now().year + 1)],
+                                     state="readonly", width=6)
+        year_combobox.pack(side=tk.LEFT, padx=3)
+
+        # (heading, scorecard key, cell format)
+        columns = [
+            ("Name", 'name', str), ("Category", 'category', lambda value: value or "Not on roster"),
+            ("Answered", 'answered', str), ("Claimed", 'claimed', str), ("Closed", 'closed', str),
+            ("Reviewed", 'reviewed', str), ("Interactions", 'interactions', str),
+            ("Mean (mins)", 'mean_response', "{:.1f}".format), ("p50 (mins)", 'p50_response', "{:.0f}".format),
+            ("p90 (mins)", 'p90_response', "{:.0f}".format), (f"Within {SLA_TARGET_MINUTES} mins", 'within_target', "{:.0%}".format),
+        ]
+        frame = tk.Frame(scorecard_window)
+        frame.pack(fill=tk.BOTH, expand=True)
+        tree = ttk.Treeview(frame, columns=[heading for heading, _, _ in columns], show='headings')
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        status = tk.Label(scorecard_window, text="")
+        status.pack()
+
+        # Rows in roster order until a heading is clicked; clicking it again reverses the order
+        scorecard = []
+        sort_state = {'key': None, 'reverse': False}
+
+        def fill():
+            tree.delete(*tree.get_children())
+            rows = scorecard
+            key = sort_state['key']
+            if key in ('name', 'category'):
+                rows = sorted(scorecard, key=lambda row: row[key] or "", reverse=sort_state['reverse'])
+            elif key:
+                rows = sorted(scorecard, key=lambda row: row[key], reverse=sort_state['reverse'])
+            for row in rows:
+                tree.insert("", tk.END, values=[format_value(row[column_key]) for _, column_key, format_value in columns])
+
+        def sort_by(key):
+            sort_state['reverse'] = not sort_state['reverse'] if sort_state['key'] == key else key not in ('name', 'category')
+            sort_state['key'] = key
+            fill()
+
+        for heading, key, _ in columns:
+            tree.heading(heading, text=heading, command=lambda key=key: sort_by(key))
+            tree.column(heading, width=130 if key in ('name', 'category') else 80, anchor=tk.W if key in ('name', 'category') else tk.E)
+
+        def loaded(rows):
+            scorecard[:] = rows
+            status.config(text=f"{len(rows)} staff")
+            fill()
+
+        def show():
+            selected_month, selected_year = month_combobox.get(), year_combobox.get()
+            if bool(selected_month) != bool(selected_year):
+                messagebox.showerror("Error", "Choose both a month and a year, or neither for all time.")
+                return
+            status.config(text="Loading...")
+            self.jobs.submit(get_staff_scorecard, selected_month or None, selected_year or None, on_done=loaded)
+
+        tk.Button(filters, text="Show", command=show).pack(side=tk.LEFT, padx=5)
+        show()
+
+    def show_diagnostics(self):
+        diagnostics_window = tk.Toplevel(self.root)
+        diagnostics_window.title("Diagnostics")
+        diagnostics_window.geometry("900x600")
+
+        sections = [
+            ("Operations", 'operations', ('Operation', 'Calls', 'Total (ms)', 'Mean (ms)', 'Max (ms)'),
+             lambda entry: (entry['operation'], entry['calls'], f"{entry['seconds'] * 1000:.1f}",
+                            f"{entry['seconds'] * 1000 / entry['calls']:.2f}", f"{entry['max_seconds'] * 1000:.1f}")),
+            ("Statements", 'statements', ('Operation', 'Calls', 'Rows', 'Total (ms)', 'Max (ms)', 'SQL'),
+             lambda entry: (entry['operation'], entry['calls'], entry['rows'], f"{entry['seconds'] * 1000:.1f}",
+                            f"{entry['max_seconds'] * 1000:.1f}", " ".join(entry['sql'].split()))),
+            (f"Slow Queries (over {query_stats.slow_query_seconds * 1000:.0f} ms)", 'slow_queries',
+             ('Operation', 'Count', 'Max (ms)', 'Plan', 'SQL'),
+             lambda slow: (slow['operation'], slow['count'], f"{slow['max_seconds'] * 1000:.1f}",
+                           "; ".join(slow['plan']), " ".join(slow['sql'].split()))),
+        ]
+        cache_label = tk.Label(diagnostics_window)
+        cache_label.pack()
+        trees = []
+        for title, _, columns, _ in sections:
+            tk.Label(diagnostics_window, text=title).pack()
+            tree = ttk.Treeview(diagnostics_window, columns=columns, show='headings', height=6)
+            for column in columns:
+                tree.heading(column, text=column)
+                tree.column(column, width=400 if column in ('SQL', 'Plan') else 90, stretch=column == 'SQL')
+            tree.pack(fill=tk.BOTH, expand=True, padx=5)
+            trees.append(tree)
+
+        def refresh():
+            cache = get_result_cache_stats()
+            cache_label.config(text=f"Result cache: {cache['hits']} hits, {cache['misses']} misses ({cache['hit_rate']:.0%}), "
+                                    f"{cache['entries']} results holding {cache['rows']} rows, "
+                                    f"dropped {cache['invalidations']} times")
+            snapshot = query_stats.snapshot()
+            for tree, (_, key, _, row_values) in zip(trees, sections):
+                tree.delete(*tree.get_children())
+                for entry in snapshot[key]:
+                    tree.insert("", tk.END, values=row_values(entry))
+
+        def reset():
+            query_stats.reset()
+            _results.reset_stats()
+            refresh()
+
+        def save(extension, file_type):
+            file_path = filedialog.asksaveasfilename(defaultextension=extension, filetypes=[file_type])
+            if file_path:
+                dump_query_stats(file_path)
+
+        profile_imports = tk.BooleanVar(value=bool(get_profile_dir()))
+
+        def toggle_profiling():
+            if not profile_imports.get():
+                set_profile_dir(None)
+                return
+            directory = filedialog.askdirectory(title="Save import and export profiles in")
+            if directory:
+                set_profile_dir(directory)
+            else:
+                profile_imports.set(False)
+
+        buttons = tk.Frame(diagnostics_window)
+        buttons.pack(pady=5)
+        tk.Button(buttons, text="Refresh", command=refresh).pack(side=tk.LEFT, padx=3)
+        tk.Button(buttons, text="Reset", command=reset).pack(side=tk.LEFT, padx=3)
+        tk.Button(buttons, text="Save JSON", command=lambda: save(".json", ("JSON files", "*.json"))).pack(side=tk.LEFT, padx=3)
+        tk.Button(buttons, text="Save Prometheus", command=lambda: save(".prom", ("Prometheus text", "*.prom"))).pack(side=tk.LEFT, padx=3)
+        tk.Checkbutton(buttons, text="Profile imports and exports", variable=profile_imports,
+                       command=toggle_profiling).pack(side=tk.LEFT, padx=3)
+        refresh()
+
+# Command line interface. Every command except the GUI runs headless and exits with
+# EXIT_OK on success or EXIT_FAILURE when an import fails or a check finds a problem;
+# argparse exits with 2 on usage errors.
+EXIT_OK = 0
+EXIT_FAILURE = 1
+
+def write_records(records, output_format, stream=None):
+    """
+    Writes a list of dicts to stdout (or `stream`) as a JSON array or as CSV with a header row.
+    """
+    stream = stream or sys.stdout
+    if output_format == 'json':
+        json.dump(records, stream, indent=2, default=str)
+        stream.write("\n")
+        return
+
+    fieldnames = []
+    for record in records:
+        fieldnames.extend(key for key in record if key not in fieldnames)
+    writer = csv.DictWriter(stream, fieldnames=fieldnames)
+    writer.writeheader()
+    writer.writerows(records)
+
+# Expand the import arguments into workbook paths; directories contribute every .xlsx file they contain
+def collect_workbooks(paths):
+    workbooks = []
+    for path in paths:
+        if os.path.isdir(path):
+            workbooks.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                    if name.lower().endswith('.xlsx') and not name.startswith('~$')))
+        else:
+            workbooks.append(path)
+    return workbooks
+
+def parse_cli_date(value):
+    iso_date = convert_excel_date(value)
+    if not iso_date:
+        raise argparse.ArgumentTypeError(f"invalid date {value!r}; use YYYY-MM-DD or MM/DD/YYYY")
+    return datetime.strptime(iso_date, "%Y-%m-%d")
+
+def trend_records(kind, months, moderator=None):
+    if kind == 'tickets':
+        return [{'month': month, 'tickets': count, 'average_response_time': average}
+                for month, count, average in get_ticket_trends(months)]
+    return [{'month': month, 'interactions': count} for month, count in get_interaction_trends(months, moderator)]
+
+# Read-only HTTP/JSON API served by `staffData.py serve`. Requests are parsed on an asyncio
+# event loop and answered on a fixed set of worker threads, each holding one pooled
+# connection opened read-only when the thread starts. Every response carries an ETag
+# over its body, so pollers sending If-None-Match get 304 Not Modified while nothing changed.
+API_READ_WORKERS = 8
+API_MAX_PAGE_SIZE = 1000
+API_IDLE_SECONDS = 15
+API_MAX_HEADER_BYTES = 16384
+API_BACKLOG = 1024
+
+HTTP_REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                431: "Request Header Fields Too Large", 500: "Internal Server Error"}
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def api_required(params, name):
+    value = params.get(name, '').strip()
+    if not value:
+        raise ApiError(400, f"missing required parameter '{name}'")
+    return value
+
+def api_int(params, name, default, low, high):
+    value = params.get(name)
+    if value is None:
+        return default
+    if not value.isdigit() or not low <= int(value) <= high:
+        raise ApiError(400, f"'{name}' must be a whole number from {low} to {high}")
+    return int(value)
+
+def api_month_filter(params):
+    month, year = params.get('month'), params.get('year')
+    if not month and not year:
+        return None, None
+    if not month or not year:
+        raise ApiError(400, "'month' and 'year' must be given together")
+    return api_int(params, 'month', None, 1, 12), api_int(params, 'year', None, 1, 9999)
+
+def encode_page_token(key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+def decode_page_token(token):
+    try:
+        key = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except ValueError:
+        key = None
+    # A page token is a (date, key) sort key; the date is None for undated rows
+    if (not isinstance(key, list) or len(key) != 2 or not isinstance(key[0], (str, type(None)))
+            or not isinstance(key[1], (str, int)) or isinstance(key[1], bool)):
+        raise ApiError(400, "invalid 'after' token")
+    return tuple(key)
+
+def api_page(params, fetch_page, count, columns, sort_key):
+    """
+    One keyset page of a moderator's tickets or interactions. `next` is the `after` token
+    for the following page, or null on the last page.
+    """
+    moderator = api_required(params, 'moderator')
+    month, year = api_month_filter(params)
+    limit = api_int(params, 'limit', SEARCH_PAGE_SIZE, 1, API_MAX_PAGE_SIZE)
+    after = decode_page_token(params['after']) if params.get('after') else None
+    rows = fetch_page(moderator, month, year, after, limit)
+    return {
+        'total': count(moderator, month, year),
+        'items': [dict(zip(columns, row)) for row in rows],
+        'next': encode_page_token(sort_key(rows[-1])) if len(rows) == limit else None,
+    }
+
+def api_tickets(params):
+    return api_page(params, get_ticket_page, count_filtered_tickets, TICKET_COLUMNS, ticket_sort_key)
+
+def api_interactions(params):
+    return api_page(params, get_interaction_page, count_filtered_interactions, INTERACTION_COLUMNS, interaction_sort_key)
+
+def api_ticket_trends(params):
+    return {'items': trend_records('tickets', api_int(params, 'months', 6, 1, 120))}
+
+def api_interaction_trends(params):
+    return {'items': trend_records('interactions', api_int(params, 'months', 6, 1, 120), params.get('moderator') or None)}
+
+def api_staff(params):
+    return {'items': [{'name': name, 'category': category} for name, category in get_all_staff()]}
+
+API_ROUTES = {
+    '/tickets': api_tickets,
+    '/interactions': api_interactions,
+    '/trends/tickets': api_ticket_trends,
+    '/trends/interactions': api_interaction_trends,
+    '/staff': api_staff,
+}
+
+def open_read_only_connection():
+    get_connection().execute("PRAGMA query_only = ON")
+
+def render_api_response(target, if_none_match):
+    """
+    Runs the route for a request target and returns (status, extra headers, JSON body).
+    """
+    from urllib.parse import urlsplit, parse_qsl
+    url = urlsplit(target)
+    route = API_ROUTES.get(url.path.rstrip('/') or '/')
+    try:
+        if route is None:
+            raise ApiError(404, f"no such endpoint; try one of {', '.join(API_ROUTES)}")
+        status, payload = 200, route(dict(parse_qsl(url.query)))
+    except ApiError as e:
+        status, payload = e.status, {'error': str(e)}
+    except Exception as e:
+        print(f"{target}: {e!r}", file=sys.stderr)
+        status, payload = 500, {'error': "internal error"}
+
+    body = json.dumps(payload, default=str).encode()
+    if status != 200:
+        return status, {}, body
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {'ETag': etag, 'Cache-Control': "no-cache"}
+    if if_none_match and (if_none_match.strip() == '*' or etag in (tag.strip() for tag in if_none_match.split(','))):
+        return 304, headers, b""
+    return 200, headers, body
+
+class ApiServer:
+    """
+    Minimal HTTP/1.1 server for API_ROUTES with keep-alive. Only GET and HEAD are accepted.
+    """
+    def __init__(self, host, port, workers=API_READ_WORKERS):
+        self.host = host
+        self.port = port
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="staffData-api",
+                                           initializer=open_read_only_connection)
+
+    async def serve(self, ready=None):
+        import asyncio
+        server = await asyncio.start_server(self.handle_connection, self.host, self.port,
+                                            limit=API_MAX_HEADER_BYTES, backlog=API_BACKLOG)
+        if ready:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+
+    async def handle_connection(self, reader, writer):
+        import asyncio
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), API_IDLE_SECONDS)
+                except asyncio.LimitOverrunError:
+                    self.send(writer, 431, {}, b"", False)
+                    break
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+
+                request_line, *header_lines = head.decode('latin-1').split("\r\n")
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    method, target, version = request_line.split()
+                except ValueError:
+                    self.send(writer, 400, {}, b"", False)
+                    break
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' and (version == "HTTP/1.1" or connection == 'keep-alive')
+                if headers.get('content-length', '0') != '0' or 'transfer-encoding' in headers:
+                    # Requests with a body are never valid here; closing avoids having to read it
+                    keep_alive = False
+
+                if method not in ('GET', 'HEAD'):
+                    status, extra_headers, body = 405, {'Allow': "GET, HEAD"}, b""
+                else:
+                    status, extra_headers, body = await loop.run_in_executor(
+                        self.executor, render_api_response, target, headers.get('if-none-match'))
+                self.send(writer, status, extra_headers, b"" if method == 'HEAD' else body, keep_alive, len(body))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def send(self, writer, status, headers, body, keep_alive, content_length=None):
+        # HEAD responses pass the length of the body they leave out
+        content_length = len(body) if content_length is None else content_length
+        lines = [f"HTTP/1.1 {status} {HTTP_REASONS[status]}", f"Content-Length: {content_length}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if content_length:
+            lines.append("Content-Type: application/json")
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body)
+
+    def run(self):
+        import asyncio
+        try:
+            asyncio.run(self.serve(lambda server: print(f"Serving the staffData API on http://{self.host}:{self.port}/",
+                                                       flush=True)))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.executor.shutdown(wait=True)
+
+def command_migrate(args):
+    start_version = get_schema_version()
+    create_database()
+    end_version = get_schema_version()
+    if start_version == end_version:
+        print(f"{args.db} is up to date at schema version {end_version}")
+    else:
+        print(f"Migrated {args.db} from schema version {start_version} to {end_version}")
+    return EXIT_OK
+
+def command_check_plans(args):
+    failures = check_query_plans()
+    for label, plan in failures:
+        print(f"FULL SCAN: {label}: {'; '.join(plan)}")
+    print(f"{len(query_plan_checks()) - len(failures)} of {len(query_plan_checks())} searches use an index")
+    return EXIT_FAILURE if failures else EXIT_OK
+
+def command_rebuild_rollups(args):
+    rebuild_rollups()
+    print("Monthly rollups rebuilt")
+    return EXIT_OK
+
+def command_rebuild_search(args):
+    rebuild_ticket_search()
+    print("Ticket full-text index rebuilt")
+    return EXIT_OK
+
+def command_check_rollups(args):
+    problems = check_rollups()
+    for problem in problems:
+        print(problem)
+    print("Monthly rollups are consistent" if not problems else f"{len(problems)} rollup rows disagree")
+    return EXIT_FAILURE if problems else EXIT_OK
+
+def command_import(args):
+    records = []
+    file_paths = collect_workbooks(args.paths)
+    if args.workers != 1 and len(file_paths) > 1:
+        results, errors = profiled(import_workbooks, file_paths, args.workers)
+        for file_path in file_paths:
+            if file_path in errors:
+                records.append({'file': file_path, 'status': 'error', 'error': errors[file_path]})
+            else:
+                result = results[file_path]
+                records.append({'file': file_path, 'status': 'ok', 'inserted': result.inserted, 'updated': result.updated,
+                                'skipped': result.skipped, 'rejected': result.rejected,
+                                'unknown_staff': result.unknown_staff, 'duplicates': result.duplicates})
+        write_records(records, args.format)
+        return EXIT_FAILURE if errors else EXIT_OK
+
+    for file_path in file_paths:
+        try:
+            result = profiled(import_workbook, file_path)
+        except Exception as e:
+            records.append({'file': file_path, 'status': 'error', 'error': str(e)})
+            continue
+        records.append({'file': file_path, 'status': 'ok', 'inserted': result.inserted, 'updated': result.updated,
+                        'skipped': result.skipped, 'rejected': result.rejected,
+                        'unknown_staff': result.unknown_staff, 'duplicates': result.duplicates})
+    write_records(records, args.format)
+    return EXIT_FAILURE if any(record['status'] == 'error' for record in records) else EXIT_OK
+
+def command_export(args):
+    counts = profiled(export_workbook, args.path, args.start, args.end, args.moderator)
+    write_records([{'sheet': sheet_name, 'rows': rows} for sheet_name, rows in counts.items()], args.format)
+    return EXIT_OK
+
+def command_trends(args):
+    write_records(trend_records(args.kind, args.months, args.moderator), args.format)
+    return EXIT_OK
+
+def command_search(args):
+    if args.kind == 'tickets':
+        rows = get_filtered_tickets(args.moderator, args.month, args.year)
+        records = [dict(zip(TICKET_COLUMNS, row)) for row in rows]
+    else:
+        rows = get_filtered_interactions(args.moderator, args.month, args.year)
+        records = [dict(zip(INTERACTION_COLUMNS, row)) for row in rows]
+    write_records(records, args.format)
+    return EXIT_OK
+
+def command_scorecard(args):
+    if bool(args.month) != bool(args.year):
+        print("--month and --year must be given together", file=sys.stderr)
+        return EXIT_FAILURE
+    write_records(get_staff_scorecard(args.month, args.year), args.format)
+    return EXIT_OK
+
+def command_ingest(args):
+    writer = IngestWriter(args.batch_size, args.max_wait_ms)
+    try:
+        if args.port or args.socket:
+            serve_ingest(writer, args.port, args.socket)
+        else:
+            ingest_lines(writer, sys.stdin, IngestStream(sys.stdout.buffer))
+    finally:
+        writer.close()
+    print(f"{writer.batches} batches committed, {writer.rejected} events rejected\n{writer.result.summary()}", file=sys.stderr)
+    return EXIT_FAILURE if writer.errors else EXIT_OK
+
+def command_serve(args):
+    ApiServer(args.host, args.port, args.workers).run()
+    return EXIT_OK
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="staffData", description="Staff Management System. "
+                                     "Run without a command to open the application window.")
+    parser.add_argument('--db', default=DB_PATH, help="path to the SQLite database (default: %(default)s)")
+    parser.add_argument('--stats-file', help="on exit, write query timings to this file (Prometheus text for .prom/.txt, else JSON)")
+    parser.add_argument('--profile-dir', help="save a cProfile capture of every import and export job in this directory")
+    subcommands = parser.add_subparsers(dest='command')
+
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument('--format', choices=('json', 'csv'), default='json', help="output format (default: json)")
+
+    command = subcommands.add_parser('migrate', help="create the schema and apply pending migrations")
+    command.set_defaults(handler=command_migrate)
+    command = subcommands.add_parser('check-plans', help="fail if any search falls back to a full table scan")
+    command.set_defaults(handler=command_check_plans)
+    command = subcommands.add_parser('rebuild-rollups', help="recompute the monthly trend rollups from the raw tables")
+    command.set_defaults(handler=command_rebuild_rollups)
+    command = subcommands.add_parser('rebuild-search', help="rebuild the full-text index over ticket notes")
+    command.set_defaults(handler=command_rebuild_search)
+    command = subcommands.add_parser('check-rollups', help="fail if the monthly trend rollups disagree with the raw tables")
+    command.set_defaults(handler=command_check_rollups)
+
+    command = subcommands.add_parser('import', parents=[output], help="import workbooks or directories of workbooks")
+    command.add_argument('paths', nargs='+', help=".xlsx files or directories containing them")
+    command.add_argument('--workers', type=int, default=0,
+                         help="parse processes for multi-file imports (default: one per core; 1 imports files one by one)")
+    command.set_defaults(handler=command_import)
+
+    command = subcommands.add_parser('export', parents=[output], help="export tickets, interactions and staff to a workbook")
+    command.add_argument('path', help="destination .xlsx file")
+    command.add_argument('--start', type=parse_cli_date, help="first date to export (inclusive)")
+    command.add_argument('--end', type=parse_cli_date, help="last date to export (inclusive)")
+    command.add_argument('--moderator', help="only tickets and interactions involving this staff member")
+    command.set_defaults(handler=command_export)
+
+    command = subcommands.add_parser('trends', parents=[output], help="monthly ticket or interaction trends")
+    command.add_argument('kind', choices=('tickets', 'interactions'))
+    command.add_argument('--months', type=int, default=6, help="length of the trend window (default: 6)")
+    command.add_argument('--moderator', help="interactions only: restrict to one moderator")
+    command.set_defaults(handler=command_trends)
+
+    command = subcommands.add_parser('search', parents=[output], help="tickets or interactions for a staff member")
+    command.add_argument('kind', choices=('tickets', 'interactions'))
+    command.add_argument('--moderator', required=True)
+    command.add_argument('--month', help="two-digit month, e.g. 03 (requires --year)")
+    command.add_argument('--year', help="four-digit year")
+    command.set_defaults(handler=command_search)
+
+    command = subcommands.add_parser('scorecard', parents=[output], help="every staff member's ticket roles, interactions "
+                                                                       "and response times for a month or all time")
+    command.add_argument('--month', help="two-digit month, e.g. 03 (requires --year)")
+    command.add_argument('--year', help="four-digit year")
+    command.set_defaults(handler=command_scorecard)
+
+    command = subcommands.add_parser('ingest', help="write JSON-lines ticket and interaction events from stdin or a socket, "
+                                                    "acknowledging each once committed")
+    listen = command.add_mutually_exclusive_group()
+    listen.add_argument('--port', type=int, help="accept event streams on this localhost TCP port instead of stdin")
+    listen.add_argument('--socket', help="accept event streams on this Unix socket instead of stdin")
+    command.add_argument('--batch-size', type=int, default=INGEST_BATCH_SIZE,
+                         help="most events committed together (default: %(default)s)")
+    command.add_argument('--max-wait-ms', type=float, default=INGEST_MAX_WAIT_MS,
+                         help="longest an event waits for its batch to fill (default: %(default)s)")
+    command.set_defaults(handler=command_ingest)
+
+    command = subcommands.add_parser('serve', help="serve tickets, interactions, trends and staff as a read-only JSON API")
+    command.add_argument('--host', default='127.0.0.1', help="address to listen on (default: %(default)s)")
+    command.add_argument('--port', type=int, default=8080, help="port to listen on (default: %(default)s)")
+    command.add_argument('--workers', type=int, default=API_READ_WORKERS,
+                         help="query threads, each with its own read-only connection (default: %(default)s)")
+    command.set_defaults(handler=command_serve)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    configure_database(args.db)
+    if args.profile_dir:
+        set_profile_dir(args.profile_dir)
+
+    if args.command:
+        try:
+            if args.command != 'migrate':
+                create_database()
+            return args.handler(args)
+        finally:
+            close_connections()
+            if args.stats_file:
+                dump_query_stats(args.stats_file)
+
     root = tk.Tk()
     app = TicketApp(root)
     root.mainloop()
+    app.jobs.shutdown()
+    close_connections()
+    if args.stats_file:
+        dump_query_stats(args.stats_file)
+    return EXIT_OK
+
+if __name__ == "__main__":
+    sys.exit(main())